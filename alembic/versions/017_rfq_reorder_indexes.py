@@ -0,0 +1,42 @@
+"""Partial indexes for reorder last-order lookups
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-17
+
+Creates: ix_rfqs_reorder_vessel_port_created, ix_rfqs_reorder_vessel_created
+Both are partial on status IN ('COMPLETED', 'AWARDED') so the prediction
+reorder lookup (latest finished RFQ per vessel, optionally per port) is a
+single backward index scan instead of a scan + sort of the vessel history.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "017"
+down_revision: str | None = "016"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # ── 1. Port-filtered lookups ─────────────────────────────────────────
+    op.execute("""
+        CREATE INDEX ix_rfqs_reorder_vessel_port_created
+          ON rfqs (vessel_id, delivery_port, created_at DESC)
+          WHERE status IN ('COMPLETED', 'AWARDED');
+    """)
+
+    # ── 2. Lookups without a port filter ─────────────────────────────────
+    op.execute("""
+        CREATE INDEX ix_rfqs_reorder_vessel_created
+          ON rfqs (vessel_id, created_at DESC)
+          WHERE status IN ('COMPLETED', 'AWARDED');
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_rfqs_reorder_vessel_created;")
+    op.execute("DROP INDEX IF EXISTS ix_rfqs_reorder_vessel_port_created;")
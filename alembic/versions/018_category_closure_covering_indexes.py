@@ -0,0 +1,53 @@
+"""Covering indexes on category_closures
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-17
+
+Creates: ix_category_closures_descendant_depth, ix_category_closures_ancestor_depth,
+         ix_category_closures_direct_children
+Drops: ix_category_closures_descendant_id (superseded by the descendant covering index)
+Hierarchy queries filter on ancestor_id or descendant_id and read depth; the
+INCLUDE columns let them run as index-only scans without heap fetches.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "018"
+down_revision: str | None = "017"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # ── 1. Covering indexes for ancestor / descendant walks ──────────────
+    op.execute("""
+        CREATE INDEX ix_category_closures_descendant_depth
+          ON category_closures (descendant_id, depth) INCLUDE (ancestor_id);
+    """)
+    op.execute("""
+        CREATE INDEX ix_category_closures_ancestor_depth
+          ON category_closures (ancestor_id, depth) INCLUDE (descendant_id);
+    """)
+
+    # ── 2. Direct-children lookups (depth = 1) ───────────────────────────
+    op.execute("""
+        CREATE INDEX ix_category_closures_direct_children
+          ON category_closures (ancestor_id)
+          WHERE depth = 1;
+    """)
+
+    # ── 3. Drop the single-column index the covering index supersedes ────
+    op.execute("DROP INDEX IF EXISTS ix_category_closures_descendant_id;")
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX ix_category_closures_descendant_id ON category_closures (descendant_id);"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_category_closures_direct_children;")
+    op.execute("DROP INDEX IF EXISTS ix_category_closures_ancestor_depth;")
+    op.execute("DROP INDEX IF EXISTS ix_category_closures_descendant_depth;")
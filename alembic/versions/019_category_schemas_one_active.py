@@ -0,0 +1,46 @@
+"""Partial unique index for the ACTIVE category schema
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-17
+
+Creates: uq_category_schemas_one_active
+get_active_schema and schema registration look up the single ACTIVE schema of
+a category; the partial unique index answers that from one index entry and
+enforces the one-ACTIVE-per-category invariant that activate_schema relies on.
+Categories that already hold several ACTIVE rows keep only the most recently
+activated one; the others are marked DEPRECATED before the index is built.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "019"
+down_revision: str | None = "018"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE category_schemas
+        SET status = 'DEPRECATED'
+        WHERE status = 'ACTIVE'
+          AND id NOT IN (
+            SELECT DISTINCT ON (category_id) id
+            FROM category_schemas
+            WHERE status = 'ACTIVE'
+            ORDER BY category_id, activated_at DESC NULLS LAST, version DESC
+          );
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX uq_category_schemas_one_active
+          ON category_schemas (category_id)
+          WHERE status = 'ACTIVE';
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_category_schemas_one_active;")
@@ -0,0 +1,29 @@
+"""Content hash on category schemas
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-17
+
+Adds: category_schemas.content_hash
+Schema registration compares the hash of an incoming schema with the ACTIVE
+one and returns the existing row when they match. Existing rows stay NULL;
+the registry falls back to comparing the JSON for those.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "020"
+down_revision: str | None = "019"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE category_schemas ADD COLUMN content_hash VARCHAR(16);")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE category_schemas DROP COLUMN IF EXISTS content_hash;")
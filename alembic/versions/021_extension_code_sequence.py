@@ -0,0 +1,39 @@
+"""Sequence for product extension codes
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-17
+
+Adds: extension_code_seq
+ProductService.generate_extension_code draws the EXT-XXXXXX suffix from this
+sequence instead of probing random numbers. It is seeded at the lowest suffix
+no product holds yet; the service skips any later value that is already taken
+(earlier random codes, or EXT codes supplied by clients).
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "021"
+down_revision: str | None = "020"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE SEQUENCE extension_code_seq START WITH 100000 MINVALUE 100000 MAXVALUE 999999;"
+    )
+    op.execute("""
+        SELECT setval('extension_code_seq', g, false)
+        FROM generate_series(100000, 999999) AS g
+        WHERE NOT EXISTS (SELECT 1 FROM products WHERE impa_code = 'EXT-' || g)
+        ORDER BY g
+        LIMIT 1;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP SEQUENCE IF EXISTS extension_code_seq;")
@@ -0,0 +1,32 @@
+"""Trigram index on products.impa_code
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-17
+
+Creates: idx_products_impa_code_trgm
+The product list search ORs ``name ILIKE '%term%'`` with the same test on
+impa_code. name is already covered by idx_products_name_trgm; with impa_code
+covered as well the planner can BitmapOr the two instead of scanning products.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "022"
+down_revision: str | None = "021"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_products_impa_code_trgm
+          ON products USING gin (impa_code gin_trgm_ops);
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_products_impa_code_trgm;")
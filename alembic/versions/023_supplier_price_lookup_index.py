@@ -0,0 +1,40 @@
+"""Current-price lookup index on supplier_product_prices
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-10-17
+
+Creates: ix_supplier_product_prices_current
+Drops: ix_supplier_product_prices_supplier_product_id (leading column of the new index)
+get_current_price filters one supplier product (and usually a currency), then
+takes the highest min_quantity still in its validity window. Ordered on
+min_quantity DESC with the window columns included, the scan stops at the
+first row that qualifies instead of sorting every price of the product.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "023"
+down_revision: str | None = "022"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX ix_supplier_product_prices_current
+          ON supplier_product_prices (supplier_product_id, currency, min_quantity DESC)
+          INCLUDE (valid_from, valid_to);
+    """)
+    op.execute("DROP INDEX IF EXISTS ix_supplier_product_prices_supplier_product_id;")
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_supplier_product_prices_supplier_product_id
+          ON supplier_product_prices (supplier_product_id);
+    """)
+    op.execute("DROP INDEX IF EXISTS ix_supplier_product_prices_current;")
@@ -0,0 +1,52 @@
+"""Constrain IMPA/ISSA mapping_confidence to the MappingConfidence values
+
+Revision ID: 024
+Revises: 023
+Create Date: 2026-10-17
+
+Normalises: impa_category_mappings.mapping_confidence, issa_category_mappings.mapping_confidence
+Creates: ck_impa_category_mappings_mapping_confidence, ck_issa_category_mappings_mapping_confidence
+The ORM reads these columns as the MappingConfidence enum, so a free-text value
+left over from before would fail to load. Values that match an enum member up
+to case/whitespace are normalised; anything else becomes PARTIAL and the
+original text is kept in notes.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "024"
+down_revision: str | None = "023"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_TABLES = ("impa_category_mappings", "issa_category_mappings")
+_VALUES = "('EXACT', 'PARTIAL', 'MANUAL')"
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"""
+            UPDATE {table}
+               SET mapping_confidence = upper(btrim(mapping_confidence))
+             WHERE upper(btrim(mapping_confidence)) IN {_VALUES}
+               AND mapping_confidence <> upper(btrim(mapping_confidence));
+        """)
+        op.execute(f"""
+            UPDATE {table}
+               SET notes = concat_ws(E'\\n', notes, 'Legacy mapping confidence: ' || mapping_confidence),
+                   mapping_confidence = 'PARTIAL'
+             WHERE mapping_confidence NOT IN {_VALUES};
+        """)
+        op.execute(f"""
+            ALTER TABLE {table}
+              ADD CONSTRAINT ck_{table}_mapping_confidence
+              CHECK (mapping_confidence IN {_VALUES});
+        """)
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS ck_{table}_mapping_confidence;")
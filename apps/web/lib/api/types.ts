@@ -43,9 +43,9 @@ export interface Product {
 }
 
 export interface ProductDetailResponse extends Product {
-  supplier_products: SupplierProduct[];
-  translations: TranslationResponse[];
-  tags: CategoryTagResponse[];
+  supplier_products: SupplierProduct[] | null;
+  translations: TranslationResponse[] | null;
+  tags: CategoryTagResponse[] | null;
 }
 
 export interface ProductListResponse {
@@ -303,11 +303,13 @@ export interface SpecsValidationResponse {
 // IMPA / ISSA Mappings
 // ---------------------------------------------------------------------------
 
+export type MappingConfidence = "EXACT" | "PARTIAL" | "MANUAL";
+
 export interface ImpaMappingResponse {
   impa_prefix: string;
   impa_category_name: string;
   internal_category_id: string;
-  mapping_confidence: string;
+  mapping_confidence: MappingConfidence;
   notes: string | null;
   last_verified: string;
 }
@@ -317,7 +319,7 @@ export interface IssaMappingResponse {
   issa_category_name: string;
   internal_category_id: string;
   impa_equivalent: string | null;
-  mapping_confidence: string;
+  mapping_confidence: MappingConfidence;
   notes: string | null;
   last_verified: string;
 }
@@ -1,6 +1,6 @@
 from src.database.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
 from src.database.engine import async_session, engine, sync_engine
-from src.database.session import get_db
+from src.database.session import get_db, get_readonly_db
 from src.database.tenant import set_admin_bypass, set_tenant_context
 
 __all__ = [
@@ -11,6 +11,7 @@ __all__ = [
     "engine",
     "sync_engine",
     "get_db",
+    "get_readonly_db",
     "set_tenant_context",
     "set_admin_bypass",
 ]
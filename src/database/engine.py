@@ -19,4 +19,6 @@ sync_engine = create_engine(
     settings.database_url_sync,
     pool_size=5,
     pool_pre_ping=True,
+    # psycopg2: batch executemany UPDATE/DELETE as well as multi-row INSERTs
+    executemany_mode="values_plus_batch",
 )
@@ -14,3 +14,13 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_readonly_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that yields a session for read-only endpoints.
+
+    Autoflush is disabled and the session is never committed; closing it rolls
+    the transaction back, so nothing a handler adds by mistake is persisted.
+    """
+    async with async_session(autoflush=False) as session:
+        yield session
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Index, Integer, SmallInteger, String, Boolean
+from sqlalchemy import ForeignKey, Index, Integer, SmallInteger, String, Boolean, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -69,5 +69,21 @@ class CategoryClosure(Base):
     )
 
     __table_args__ = (
-        Index("ix_category_closures_descendant_id", "descendant_id"),
+        Index(
+            "ix_category_closures_descendant_depth",
+            "descendant_id",
+            "depth",
+            postgresql_include=["ancestor_id"],
+        ),
+        Index(
+            "ix_category_closures_ancestor_depth",
+            "ancestor_id",
+            "depth",
+            postgresql_include=["descendant_id"],
+        ),
+        Index(
+            "ix_category_closures_direct_children",
+            "ancestor_id",
+            postgresql_where=text("depth = 1"),
+        ),
     )
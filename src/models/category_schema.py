@@ -6,7 +6,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -25,7 +25,11 @@ class CategorySchema(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     )
     version: Mapped[int] = mapped_column(Integer, nullable=False)
     schema_json: Mapped[dict] = mapped_column(JSONB, nullable=False)
-    status: Mapped[SchemaStatus] = mapped_column(String(20), server_default="DRAFT", nullable=False)
+    # blake2b-64 of the canonical schema JSON; NULL for rows predating migration 020
+    content_hash: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    status: Mapped[SchemaStatus] = mapped_column(
+        Enum(SchemaStatus, native_enum=False, length=20), server_default="DRAFT", nullable=False
+    )
     created_by: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
@@ -36,4 +40,10 @@ class CategorySchema(UUIDPrimaryKeyMixin, TimestampMixin, Base):
 
     __table_args__ = (
         UniqueConstraint("category_id", "version", name="uq_category_schemas_category_version"),
+        Index(
+            "uq_category_schemas_one_active",
+            "category_id",
+            unique=True,
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
     )
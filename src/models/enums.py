@@ -64,6 +64,12 @@ class SchemaStatus(str, enum.Enum):
     DEPRECATED = "DEPRECATED"
 
 
+class MappingConfidence(str, enum.Enum):
+    EXACT = "EXACT"
+    PARTIAL = "PARTIAL"
+    MANUAL = "MANUAL"
+
+
 class SupplierTier(str, enum.Enum):
     PENDING = "PENDING"
     BASIC = "BASIC"
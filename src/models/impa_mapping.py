@@ -4,11 +4,12 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.database.base import Base
+from src.models.enums import MappingConfidence
 
 if TYPE_CHECKING:
     from src.models.category import Category
@@ -23,7 +24,9 @@ class ImpaCategoryMapping(Base):
     internal_category_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("categories.id"), nullable=False
     )
-    mapping_confidence: Mapped[str] = mapped_column(String(20), server_default="EXACT", nullable=False)
+    mapping_confidence: Mapped[MappingConfidence] = mapped_column(
+        Enum(MappingConfidence, native_enum=False, length=20), server_default="EXACT", nullable=False
+    )
     notes: Mapped[str | None] = mapped_column(String)
     last_verified: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     verified_by_id: Mapped[uuid.UUID | None] = mapped_column(
@@ -34,6 +37,13 @@ class ImpaCategoryMapping(Base):
     internal_category: Mapped[Category] = relationship("Category", back_populates="impa_mappings")
     verified_by: Mapped[User | None] = relationship("User", back_populates="verified_mappings")
 
+    __table_args__ = (
+        CheckConstraint(
+            "mapping_confidence IN ('EXACT', 'PARTIAL', 'MANUAL')",
+            name="ck_impa_category_mappings_mapping_confidence",
+        ),
+    )
+
 
 class IssaCategoryMapping(Base):
     __tablename__ = "issa_category_mappings"
@@ -44,9 +54,18 @@ class IssaCategoryMapping(Base):
         UUID(as_uuid=True), ForeignKey("categories.id"), nullable=False
     )
     impa_equivalent: Mapped[str | None] = mapped_column(String(2))
-    mapping_confidence: Mapped[str] = mapped_column(String(20), server_default="EXACT", nullable=False)
+    mapping_confidence: Mapped[MappingConfidence] = mapped_column(
+        Enum(MappingConfidence, native_enum=False, length=20), server_default="EXACT", nullable=False
+    )
     notes: Mapped[str | None] = mapped_column(String)
     last_verified: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
     # Relationships
     internal_category: Mapped[Category] = relationship("Category", back_populates="issa_mappings")
+
+    __table_args__ = (
+        CheckConstraint(
+            "mapping_confidence IN ('EXACT', 'PARTIAL', 'MANUAL')",
+            name="ck_issa_category_mappings_mapping_confidence",
+        ),
+    )
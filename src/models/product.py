@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import Boolean, Computed, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy import Boolean, Computed, DateTime, ForeignKey, Index, Integer, Sequence, String
 from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,6 +17,15 @@ if TYPE_CHECKING:
     from src.models.translation import ProductTranslation
     from src.models.unit import UnitConversion
 
+# Numeric suffix for EXT-XXXXXX extension codes (migration 021 seeds it past existing codes)
+extension_code_seq = Sequence(
+    "extension_code_seq",
+    start=100000,
+    minvalue=100000,
+    maxvalue=999999,
+    metadata=Base.metadata,
+)
+
 
 class Product(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "products"
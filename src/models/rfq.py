@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -121,4 +121,17 @@ class Rfq(UUIDPrimaryKeyMixin, TimestampMixin, Base):
             postgresql_where="status IN ('PUBLISHED', 'BIDDING_OPEN')",
         ),
         Index("ix_rfqs_reference_number", "reference_number"),
+        Index(
+            "ix_rfqs_reorder_vessel_port_created",
+            "vessel_id",
+            "delivery_port",
+            text("created_at DESC"),
+            postgresql_where="status IN ('COMPLETED', 'AWARDED')",
+        ),
+        Index(
+            "ix_rfqs_reorder_vessel_created",
+            "vessel_id",
+            text("created_at DESC"),
+            postgresql_where="status IN ('COMPLETED', 'AWARDED')",
+        ),
     )
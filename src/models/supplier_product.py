@@ -5,7 +5,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, Numeric, String, UniqueConstraint
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, Numeric, String, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -71,6 +71,14 @@ class SupplierProductPrice(UUIDPrimaryKeyMixin, Base):
     supplier_product: Mapped[SupplierProduct] = relationship("SupplierProduct", back_populates="prices")
 
     __table_args__ = (
-        Index("ix_supplier_product_prices_supplier_product_id", "supplier_product_id"),
+        # get_current_price: walks min_quantity high-to-low per supplier product
+        # and currency, checking the validity window from the index
+        Index(
+            "ix_supplier_product_prices_current",
+            "supplier_product_id",
+            "currency",
+            text("min_quantity DESC"),
+            postgresql_include=["valid_from", "valid_to"],
+        ),
         Index("ix_supplier_product_prices_valid_range", "valid_from", "valid_to"),
     )
@@ -130,7 +130,7 @@ class TestGetProductDetails:
             "src.modules.product.service.ProductService"
         ) as mock_svc_cls:
             mock_svc = AsyncMock()
-            mock_svc.get_product_detail.return_value = mock_product
+            mock_svc.get_product.return_value = mock_product
             mock_svc_cls.return_value = mock_svc
 
             result = await executor.execute(
@@ -138,7 +138,7 @@ class TestGetProductDetails:
             )
 
             assert result["id"] == str(product_id)
-            mock_svc.get_product_detail.assert_called_once_with(product_id)
+            mock_svc.get_product.assert_called_once_with(product_id)
 
 
 class TestCreateRfq:
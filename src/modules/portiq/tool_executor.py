@@ -81,7 +81,8 @@ class ToolExecutor:
         if _IMPA_RE.match(identifier):
             product = await svc.get_product_by_impa(identifier)
         else:
-            product = await svc.get_product_detail(uuid.UUID(identifier))
+            # Only scalar columns are returned, so skip the detail collections
+            product = await svc.get_product(uuid.UUID(identifier))
 
         return {
             "id": str(product.id),
@@ -123,3 +123,7 @@ HISTORY_WEIGHT = 0.7
 # Confidence scores
 RULES_ONLY_CONFIDENCE = 0.55
 BLENDED_CONFIDENCE = 0.78
+
+# Reorder quantity scaling baselines (source RFQs do not store voyage/crew)
+REORDER_REFERENCE_VOYAGE_DAYS = 14
+REORDER_REFERENCE_CREW_SIZE = 20
@@ -6,22 +6,81 @@ with optional quantity adjustments for different voyage durations or crew sizes.
 
 from __future__ import annotations
 
+import functools
 import logging
+import sys
 import uuid
+from collections.abc import Sequence
 from decimal import Decimal
+from typing import Any
 
-from sqlalchemy import select
+from cachetools import TTLCache
+from sqlalchemy import Connection, Row, event, func, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import Mapper, Session, joinedload
 
 from src.exceptions import NotFoundException
 from src.models.enums import RfqStatus
 from src.models.rfq import Rfq
 from src.models.rfq_line_item import RfqLineItem
+from src.modules.prediction.constants import (
+    REORDER_REFERENCE_CREW_SIZE,
+    REORDER_REFERENCE_VOYAGE_DAYS,
+)
 from src.modules.prediction.schemas import PredictedItem, ReorderSuggestion
 
 logger = logging.getLogger(__name__)
 
+# Process-local cache of last-order lookups keyed on (organization_id, vessel_id, port).
+# Entries are dropped once a transaction that changed an RFQ's status for the
+# vessel commits (see listeners below); the TTL bounds staleness across worker
+# processes.  Callers get deep copies, so cached suggestions are never shared.
+_last_order_cache: TTLCache[
+    tuple[uuid.UUID, uuid.UUID, str | None], ReorderSuggestion | None
+] = TTLCache(maxsize=4096, ttl=60)
+# Session.info key holding cache keys to evict when the session commits
+_PENDING_EVICTIONS = "reorder_last_order_evictions"
+_CACHE_MISS = object()
+_ONE = Decimal(1)
+
+
+@functools.lru_cache(maxsize=4096)
+def _category_prefix(impa_code: str) -> str:
+    """Return the interned 2-digit IMPA category prefix for ``impa_code``."""
+    return sys.intern(impa_code[:2]) if len(impa_code) >= 2 else "00"
+
+
+@event.listens_for(Rfq, "after_update")
+def _queue_last_order_eviction(mapper: Mapper[Rfq], connection: Connection, target: Rfq) -> None:
+    """Queue cached last-order lookups for eviction when an RFQ's status changes.
+
+    Evicting at flush time would let a concurrent request re-cache the old
+    result before the change commits, so keys are held on the session until
+    ``after_commit``.
+    """
+    if target.vessel_id is None or not inspect(target).attrs.status.history.has_changes():
+        return
+    keys = {(target.buyer_organization_id, target.vessel_id, port) for port in (None, target.delivery_port)}
+    session = inspect(target).session
+    if session is None:
+        for key in keys:
+            _last_order_cache.pop(key, None)
+        return
+    session.info.setdefault(_PENDING_EVICTIONS, set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_last_order_cache(session: Session) -> None:
+    """Drop the lookups queued by ``_queue_last_order_eviction`` once committed."""
+    for key in session.info.pop(_PENDING_EVICTIONS, ()):
+        _last_order_cache.pop(key, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_last_order_evictions(session: Session) -> None:
+    """Forget queued evictions whose status changes were rolled back."""
+    session.info.pop(_PENDING_EVICTIONS, None)
+
 
 class ReorderService:
     """Find and copy line items from previous RFQs for reorder workflows."""
@@ -37,20 +96,43 @@ class ReorderService:
         self,
         vessel_id: uuid.UUID,
         port: str | None = None,
+        organization_id: uuid.UUID | None = None,
     ) -> ReorderSuggestion | None:
         """Find the most recent COMPLETED or AWARDED RFQ for this vessel.
 
         Optionally filters by delivery port (UN/LOCODE).  Returns a
         ReorderSuggestion with the RFQ's line items converted to
-        PredictedItem format.
+        PredictedItem format.  When ``organization_id`` is given, results
+        are served from a short-lived tenant-scoped cache.
         """
-        query = (
-            select(Rfq)
-            .options(joinedload(Rfq.line_items))
-            .where(
-                Rfq.vessel_id == vessel_id,
-                Rfq.status.in_([RfqStatus.COMPLETED, RfqStatus.AWARDED]),
-            )
+        if organization_id is None:
+            return await self._fetch_last_order(vessel_id, port)
+
+        cache_key = (organization_id, vessel_id, port)
+        cached = _last_order_cache.get(cache_key, _CACHE_MISS)
+        if cached is not _CACHE_MISS:
+            return cached.model_copy(deep=True) if cached is not None else None
+
+        suggestion = await self._fetch_last_order(vessel_id, port)
+        _last_order_cache[cache_key] = suggestion.model_copy(deep=True) if suggestion is not None else None
+        return suggestion
+
+    async def _fetch_last_order(
+        self,
+        vessel_id: uuid.UUID,
+        port: str | None,
+    ) -> ReorderSuggestion | None:
+        """Query the most recent COMPLETED or AWARDED RFQ for this vessel.
+
+        Fetches the RFQ header columns first and only loads line items when
+        a matching RFQ exists, so the "no previous order" case costs a
+        single narrow query.
+        """
+        query = select(
+            Rfq.id, Rfq.reference_number, Rfq.created_at, Rfq.delivery_port
+        ).where(
+            Rfq.vessel_id == vessel_id,
+            Rfq.status.in_([RfqStatus.COMPLETED, RfqStatus.AWARDED]),
         )
 
         if port:
@@ -59,22 +141,73 @@ class ReorderService:
         query = query.order_by(Rfq.created_at.desc()).limit(1)
 
         result = await self.db.execute(query)
-        rfq = result.unique().scalar_one_or_none()
+        header = result.one_or_none()
 
-        if rfq is None:
+        if header is None:
             return None
 
-        line_items = self._rfq_line_items_to_predicted(rfq.line_items)
+        # Plain column rows skip ORM hydration; the converter only needs
+        # attribute access, which Row provides.
+        items_result = await self.db.execute(
+            select(
+                RfqLineItem.impa_code,
+                RfqLineItem.product_id,
+                RfqLineItem.description,
+                RfqLineItem.quantity,
+                RfqLineItem.unit_of_measure,
+            )
+            .where(RfqLineItem.rfq_id == header.id)
+            .order_by(RfqLineItem.line_number)
+        )
 
         return ReorderSuggestion(
-            source_rfq_id=rfq.id,
-            source_rfq_reference=rfq.reference_number,
-            created_at=rfq.created_at,
-            delivery_port=rfq.delivery_port,
-            line_items=line_items,
+            source_rfq_id=header.id,
+            source_rfq_reference=header.reference_number,
+            created_at=header.created_at,
+            delivery_port=header.delivery_port,
+            line_items=self._rfq_line_items_to_predicted(items_result.all()),
             quantity_adjustments={},
         )
 
+    async def get_last_orders_bulk(
+        self,
+        vessel_id: uuid.UUID,
+        ports: list[str],
+    ) -> dict[str, ReorderSuggestion]:
+        """Find the most recent COMPLETED or AWARDED RFQ per delivery port.
+
+        Resolves all ports in a single round trip: a ``ROW_NUMBER()`` window
+        partitioned by delivery port picks the latest RFQ for each one.
+        Ports without a matching RFQ are omitted from the result.
+        """
+        if not ports:
+            return {}
+
+        ranked = (
+            select(
+                Rfq.id,
+                func.row_number()
+                .over(partition_by=Rfq.delivery_port, order_by=Rfq.created_at.desc())
+                .label("rank"),
+            )
+            .where(
+                Rfq.vessel_id == vessel_id,
+                Rfq.delivery_port.in_(ports),
+                Rfq.status.in_([RfqStatus.COMPLETED, RfqStatus.AWARDED]),
+            )
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(Rfq)
+            .options(joinedload(Rfq.line_items))
+            .join(ranked, ranked.c.id == Rfq.id)
+            .where(ranked.c.rank == 1)
+        )
+        return {
+            rfq.delivery_port: self._rfq_to_suggestion(rfq)
+            for rfq in result.unique().scalars().all()
+        }
+
     async def copy_from_rfq(
         self,
         source_rfq_id: uuid.UUID,
@@ -96,13 +229,11 @@ class ReorderService:
         if rfq is None:
             raise NotFoundException(f"RFQ {source_rfq_id} not found")
 
-        line_items = self._rfq_line_items_to_predicted(rfq.line_items)
-
-        # Scale quantities if adjustment parameters are provided
-        if voyage_days is not None or crew_size is not None:
-            line_items = self._adjust_quantities(
-                line_items, voyage_days=voyage_days, crew_size=crew_size
-            )
+        line_items = self.adjust_line_items(
+            self._rfq_line_items_to_predicted(rfq.line_items),
+            voyage_days=voyage_days,
+            crew_size=crew_size,
+        )
 
         logger.info(
             "Copied %d line items from RFQ %s (adjustments: days=%s, crew=%s)",
@@ -113,32 +244,63 @@ class ReorderService:
         )
         return line_items
 
+    def adjust_line_items(
+        self,
+        line_items: list[PredictedItem],
+        voyage_days: int | None = None,
+        crew_size: int | None = None,
+    ) -> list[PredictedItem]:
+        """Scale already-loaded line items for a new voyage duration/crew size.
+
+        Returns ``line_items`` unchanged when no parameter differs from the
+        reference baselines.
+        """
+        if (voyage_days is not None and voyage_days != REORDER_REFERENCE_VOYAGE_DAYS) or (
+            crew_size is not None and crew_size != REORDER_REFERENCE_CREW_SIZE
+        ):
+            return self._adjust_quantities(
+                line_items, voyage_days=voyage_days, crew_size=crew_size
+            )
+        return line_items
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    @classmethod
+    def _rfq_to_suggestion(cls, rfq: Rfq) -> ReorderSuggestion:
+        """Build a ReorderSuggestion from an RFQ with its line items loaded."""
+        return ReorderSuggestion(
+            source_rfq_id=rfq.id,
+            source_rfq_reference=rfq.reference_number,
+            created_at=rfq.created_at,
+            delivery_port=rfq.delivery_port,
+            line_items=cls._rfq_line_items_to_predicted(rfq.line_items),
+            quantity_adjustments={},
+        )
+
     @staticmethod
     def _rfq_line_items_to_predicted(
-        line_items: list[RfqLineItem],
+        line_items: Sequence[RfqLineItem] | Sequence[Row[Any]],
     ) -> list[PredictedItem]:
-        """Convert RFQ line items to PredictedItem format."""
-        predicted: list[PredictedItem] = []
-        for item in line_items:
-            impa_code = item.impa_code or "000000"
-            category_prefix = impa_code[:2] if len(impa_code) >= 2 else "00"
-
-            predicted.append(
-                PredictedItem(
-                    impa_code=impa_code,
-                    product_id=item.product_id,
-                    description=item.description,
-                    quantity=item.quantity,
-                    unit=item.unit_of_measure,
-                    confidence=0.9,  # high confidence — based on actual past order
-                    category_prefix=category_prefix,
-                )
+        """Convert RFQ line items (ORM objects or column rows) to PredictedItem format.
+
+        Values come straight from persisted rows and are already well-formed,
+        so ``model_construct`` is used to skip per-item re-validation.
+        """
+        return [
+            PredictedItem.model_construct(
+                impa_code=impa_code,
+                product_id=item.product_id,
+                description=item.description,
+                quantity=item.quantity,
+                unit=item.unit_of_measure,
+                confidence=0.9,  # high confidence — based on actual past order
+                category_prefix=_category_prefix(impa_code),
             )
-        return predicted
+            for item in line_items
+            for impa_code in (item.impa_code or "000000",)
+        ]
 
     @staticmethod
     def _adjust_quantities(
@@ -156,25 +318,24 @@ class ReorderService:
         Future improvement: Store voyage_days and crew_size on Rfq model,
         then use source RFQ values as the reference for relative scaling.
         """
-        logger.warning(
-            "Reorder adjustment uses fixed reference baselines (14d/20crew), not source RFQ values"
-        )
-
-        reference_voyage_days = 14
-        reference_crew_size = 20
-
         voyage_factor = (
-            Decimal(str(voyage_days)) / Decimal(str(reference_voyage_days))
+            Decimal(voyage_days) / Decimal(REORDER_REFERENCE_VOYAGE_DAYS)
             if voyage_days is not None
-            else Decimal("1")
+            else _ONE
         )
         crew_factor = (
-            Decimal(str(crew_size)) / Decimal(str(reference_crew_size))
+            Decimal(crew_size) / Decimal(REORDER_REFERENCE_CREW_SIZE)
             if crew_size is not None
-            else Decimal("1")
+            else _ONE
         )
 
         adjustment_factor = voyage_factor * crew_factor
+        if adjustment_factor == _ONE:
+            return items
+
+        logger.warning(
+            "Reorder adjustment uses fixed reference baselines (14d/20crew), not source RFQ values"
+        )
 
         adjusted: list[PredictedItem] = []
         for item in items:
@@ -108,7 +108,9 @@ async def get_last_order(
     Returns the RFQ's line items as reorder suggestions.
     """
     svc = ReorderService(db)
-    return await svc.get_last_order(vessel_id=vessel_id, port=port)
+    return await svc.get_last_order(
+        vessel_id=vessel_id, port=port, organization_id=current_user.organization_id
+    )
 
 
 @router.post("/reorder/copy", response_model=list[PredictedItem])
@@ -136,19 +138,18 @@ async def copy_from_rfq(
     if body.vessel_id is None:
         return []
 
-    suggestion = await svc.get_last_order(vessel_id=body.vessel_id, port=body.port)
+    suggestion = await svc.get_last_order(
+        vessel_id=body.vessel_id, port=body.port, organization_id=current_user.organization_id
+    )
     if suggestion is None:
         return []
 
-    # If adjustment params provided, copy-from-rfq with adjustments
-    if body.voyage_days is not None or body.crew_size is not None:
-        return await svc.copy_from_rfq(
-            source_rfq_id=suggestion.source_rfq_id,
-            voyage_days=body.voyage_days,
-            crew_size=body.crew_size,
-        )
-
-    return suggestion.line_items
+    # Adjust the already-loaded line items rather than re-fetching the RFQ
+    return svc.adjust_line_items(
+        suggestion.line_items,
+        voyage_days=body.voyage_days,
+        crew_size=body.crew_size,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -2,12 +2,11 @@
 
 from __future__ import annotations
 
-import re
 import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 # ---------------------------------------------------------------------------
 # Core response schemas
@@ -17,8 +16,6 @@ from pydantic import BaseModel, ConfigDict, Field, field_validator, model_valida
 class PredictedItem(BaseModel):
     """A single predicted line item with quantity and confidence."""
 
-    model_config = ConfigDict(from_attributes=True)
-
     impa_code: str = Field(..., description="6-digit IMPA code")
     product_id: uuid.UUID | None = Field(None, description="Catalog product UUID if matched")
     description: str = Field(..., description="Product/item description")
@@ -31,8 +28,6 @@ class PredictedItem(BaseModel):
 class TemplateResponse(BaseModel):
     """Template metadata returned when listing available templates."""
 
-    model_config = ConfigDict(from_attributes=True)
-
     id: str = Field(..., description="Template identifier (e.g. TANKER, DRYDOCK)")
     name: str = Field(..., description="Human-readable template name")
     description: str = Field(..., description="Template description")
@@ -50,8 +45,6 @@ class TemplateResponse(BaseModel):
 class ReorderSuggestion(BaseModel):
     """Reorder suggestion based on a previous RFQ."""
 
-    model_config = ConfigDict(from_attributes=True)
-
     source_rfq_id: uuid.UUID = Field(..., description="ID of the source RFQ")
     source_rfq_reference: str = Field(..., description="Reference number of source RFQ")
     created_at: datetime = Field(..., description="When the source RFQ was created")
@@ -68,8 +61,6 @@ class ReorderSuggestion(BaseModel):
 class CoOccurrenceSuggestion(BaseModel):
     """A co-occurrence suggestion (items frequently ordered together)."""
 
-    model_config = ConfigDict(from_attributes=True)
-
     impa_code: str = Field(..., description="IMPA code of suggested item")
     product_id: uuid.UUID | None = Field(None, description="Catalog product UUID if matched")
     description: str = Field(..., description="Product description")
@@ -102,7 +93,7 @@ class PredictionRequest(BaseModel):
     def validate_categories(cls, v: list[str] | None) -> list[str] | None:
         if v is not None:
             for cat in v:
-                if not re.match(r"^\d{2}$", cat):
+                if len(cat) != 2 or not (cat.isascii() and cat.isdigit()):
                     raise ValueError(f"Invalid category prefix: {cat}. Must be 2 digits.")
         return v
 
@@ -156,6 +147,6 @@ class CoOccurrenceRequest(BaseModel):
     @classmethod
     def validate_impa_codes(cls, v: list[str]) -> list[str]:
         for code in v:
-            if not re.match(r"^\d{6}$", code):
+            if len(code) != 6 or not (code.isascii() and code.isdigit()):
                 raise ValueError(f"Invalid IMPA code format: {code}. Must be 6 digits.")
         return v
@@ -19,10 +19,60 @@ from src.modules.prediction.constants import (
 from src.modules.prediction.consumption_engine import ConsumptionEngine
 from src.modules.prediction.schemas import PredictedItem, TemplateResponse
 
+# Templates are static configuration, so their responses are built once at import.
+_VESSEL_TEMPLATES: tuple[TemplateResponse, ...] = tuple(
+    TemplateResponse(
+        id=f"VESSEL_{type_key}",
+        name=template_data["name"],
+        description=template_data["description"],
+        vessel_types=[type_key],
+        categories=template_data["categories"],
+        voyage_type=None,
+    )
+    for type_key, template_data in VESSEL_TYPE_TEMPLATES.items()
+)
+
+_VOYAGE_TEMPLATES: tuple[TemplateResponse, ...] = tuple(
+    TemplateResponse(
+        id=f"VOYAGE_{voyage_key}",
+        name=voyage_data["name"],
+        description=f"Up to {voyage_data['max_days']} days",
+        vessel_types=[],
+        categories=[],
+        voyage_type=voyage_key,
+    )
+    for voyage_key, voyage_data in VOYAGE_TYPE_TEMPLATES.items()
+)
+
+_VOYAGE_MAX_DAYS: dict[str | None, int] = {
+    voyage_key: voyage_data["max_days"]
+    for voyage_key, voyage_data in VOYAGE_TYPE_TEMPLATES.items()
+}
+
+_EVENT_TEMPLATES: tuple[TemplateResponse, ...] = tuple(
+    TemplateResponse(
+        id=f"EVENT_{event_key}",
+        name=event_data["name"],
+        description=event_data["description"],
+        vessel_types=[],
+        categories=event_data["categories"],
+        voyage_type=None,
+    )
+    for event_key, event_data in EVENT_TEMPLATES.items()
+)
+
 
 class TemplateService:
     """List and apply procurement templates."""
 
+    # Template ID prefix -> (label, template table, key holding its categories)
+    _TEMPLATE_DISPATCH: dict[str, tuple[str, dict[str, dict], str | None]] = {
+        "VESSEL_": ("Vessel", VESSEL_TYPE_TEMPLATES, "categories"),
+        # None: voyage templates use all categories, the engine handles adjustments
+        "VOYAGE_": ("Voyage", VOYAGE_TYPE_TEMPLATES, None),
+        "EVENT_": ("Event", EVENT_TEMPLATES, "categories"),
+    }
+
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
 
@@ -39,53 +89,19 @@ class TemplateService:
 
         Combines vessel-type templates, voyage-type templates, and event
         templates into a single list.  Filters are applied when provided.
+        Templates are static, so the prebuilt module-level responses are
+        returned rather than constructing new models per request.
         """
-        templates: list[TemplateResponse] = []
-
-        # Vessel-type templates
-        for type_key, template_data in VESSEL_TYPE_TEMPLATES.items():
-            if vessel_type and type_key != vessel_type:
-                continue
-            templates.append(
-                TemplateResponse(
-                    id=f"VESSEL_{type_key}",
-                    name=template_data["name"],
-                    description=template_data["description"],
-                    vessel_types=[type_key],
-                    categories=template_data["categories"],
-                    voyage_type=None,
-                )
-            )
-
-        # Voyage-type templates
-        for voyage_key, voyage_data in VOYAGE_TYPE_TEMPLATES.items():
-            if voyage_days is not None and voyage_days > voyage_data["max_days"]:
-                continue
-            templates.append(
-                TemplateResponse(
-                    id=f"VOYAGE_{voyage_key}",
-                    name=voyage_data["name"],
-                    description=f"Up to {voyage_data['max_days']} days",
-                    vessel_types=[],
-                    categories=[],
-                    voyage_type=voyage_key,
-                )
-            )
-
-        # Event templates (always included — not filtered by vessel/voyage)
-        for event_key, event_data in EVENT_TEMPLATES.items():
-            templates.append(
-                TemplateResponse(
-                    id=f"EVENT_{event_key}",
-                    name=event_data["name"],
-                    description=event_data["description"],
-                    vessel_types=[],
-                    categories=event_data["categories"],
-                    voyage_type=None,
-                )
-            )
-
-        return templates
+        return [
+            *(t for t in _VESSEL_TEMPLATES if not vessel_type or vessel_type in t.vessel_types),
+            *(
+                t
+                for t in _VOYAGE_TEMPLATES
+                if voyage_days is None or voyage_days <= _VOYAGE_MAX_DAYS[t.voyage_type]
+            ),
+            # Event templates (always included — not filtered by vessel/voyage)
+            *_EVENT_TEMPLATES,
+        ]
 
     async def apply_template(
         self,
@@ -115,32 +131,16 @@ class TemplateService:
     # Helpers
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def _resolve_template_categories(template_id: str) -> list[str]:
+    @classmethod
+    def _resolve_template_categories(cls, template_id: str) -> list[str]:
         """Resolve a template ID to a list of IMPA category prefixes."""
-        parts = template_id.split("_", 1)
-        if len(parts) != 2:
-            raise NotFoundException(f"Template '{template_id}' not found")
-
-        template_type, template_key = parts
-
-        if template_type == "VESSEL":
-            template_data = VESSEL_TYPE_TEMPLATES.get(template_key)
+        for prefix, (label, templates, categories_key) in cls._TEMPLATE_DISPATCH.items():
+            if not template_id.startswith(prefix):
+                continue
+            template_key = template_id[len(prefix):]
+            template_data = templates.get(template_key)
             if template_data is None:
-                raise NotFoundException(f"Vessel template '{template_key}' not found")
-            return template_data["categories"]
-
-        if template_type == "VOYAGE":
-            voyage_data = VOYAGE_TYPE_TEMPLATES.get(template_key)
-            if voyage_data is None:
-                raise NotFoundException(f"Voyage template '{template_key}' not found")
-            # Voyage templates use all categories (the engine handles adjustments)
-            return []
-
-        if template_type == "EVENT":
-            event_data = EVENT_TEMPLATES.get(template_key)
-            if event_data is None:
-                raise NotFoundException(f"Event template '{template_key}' not found")
-            return event_data["categories"]
+                raise NotFoundException(f"{label} template '{template_key}' not found")
+            return template_data[categories_key] if categories_key else []
 
         raise NotFoundException(f"Template '{template_id}' not found")
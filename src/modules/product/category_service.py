@@ -2,12 +2,33 @@
 
 from __future__ import annotations
 
+import json
+import re
 import uuid
 from datetime import datetime, timezone
-
-from sqlalchemy import delete, func, select, text, update
+from typing import Any
+
+from cachetools import TTLCache
+from sqlalchemy import (
+    RowMapping,
+    Select,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    select,
+    text,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.types import UserDefinedType
 
 from src.exceptions import ConflictException, NotFoundException, ValidationException
 from src.models.category import Category, CategoryClosure
@@ -15,6 +36,10 @@ from src.models.category_schema import CategorySchema
 from src.models.enums import CategoryStatus, SchemaStatus
 from src.models.impa_mapping import ImpaCategoryMapping, IssaCategoryMapping
 from src.models.product import Product
+from src.modules.product.constants import (
+    CATEGORY_TREE_YIELD_PER,
+    PRODUCT_COUNT_ESTIMATE_BUDGET,
+)
 from src.modules.product.schemas import (
     CategoryBreadcrumb,
     CategoryCreate,
@@ -25,10 +50,66 @@ from src.modules.product.schemas import (
     IssaMappingCreate,
 )
 
+# Planner estimate for the rows an exact subtree product count would scan
+_SUBTREE_PRODUCTS_EXPLAIN = text(
+    "EXPLAIN (FORMAT JSON) "
+    "SELECT 1 FROM products WHERE category_id IN ("
+    "SELECT descendant_id FROM category_closures WHERE ancestor_id = :category_id)"
+)
+
+
+class _Ltree(UserDefinedType):
+    """Postgres ``ltree``; ``Category.path`` is stored as text and cast on use."""
+
+    cache_ok = True
+
+    def get_col_spec(self, **kw: Any) -> str:
+        return "LTREE"
+
+
+def _as_ltree(expr: ColumnElement[Any]) -> ColumnElement[Any]:
+    return cast(expr, _Ltree())
+
+
+# Process-wide prefix -> category id lookups; unmapped prefixes cache as None.
+# Upserts drop their own prefix, the TTL bounds staleness across workers.
+_impa_prefix_cache: TTLCache[str, uuid.UUID | None] = TTLCache(maxsize=1024, ttl=300)
+_issa_prefix_cache: TTLCache[str, uuid.UUID | None] = TTLCache(maxsize=1024, ttl=300)
+# Category.impa_prefix -> (id, name) for IMPA validation suggestions; category
+# create/update drop the affected prefix
+_category_prefix_cache: TTLCache[str, tuple[uuid.UUID, str] | None] = TTLCache(maxsize=1024, ttl=300)
+_CACHE_MISS = object()
+
+
+def nearest_active_schema_select(
+    column: ColumnElement[Any], category_id: uuid.UUID | ColumnElement[Any]
+) -> Select[Any]:
+    """SELECT *column* of the nearest ACTIVE CategorySchema at or above *category_id*.
+
+    *category_id* may be a column (e.g. ``Product.category_id``) so the query
+    can be embedded as a correlated scalar subquery.
+    """
+    return (
+        select(column)
+        .join(CategoryClosure, CategoryClosure.ancestor_id == CategorySchema.category_id)
+        .where(
+            CategoryClosure.descendant_id == category_id,
+            CategorySchema.status == SchemaStatus.ACTIVE,
+        )
+        .order_by(CategoryClosure.depth.asc())
+        .limit(1)
+    )
+
 
 class CategoryService:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
+        # Per-request cache of categories already loaded by _get_category_or_404
+        self._category_cache: dict[uuid.UUID, Category] = {}
+
+    # Hot read paths below build their statements with ``lambda_stmt`` so
+    # SQLAlchemy caches the constructed statement and only re-binds the
+    # closed-over parameters on each call.
 
     # ------------------------------------------------------------------
     # CRUD
@@ -36,22 +117,28 @@ class CategoryService:
 
     async def create_category(self, data: CategoryCreate) -> Category:
         """Create a category and populate the closure table entries."""
-        # Check for duplicate code
-        existing = await self._session.execute(
-            select(Category.id).where(Category.code == data.code)
-        )
-        if existing.scalar_one_or_none() is not None:
-            raise ConflictException(f"Category code '{data.code}' already exists")
+        # Duplicate-code check and parent lookup share one round trip
+        criteria = Category.code == data.code
+        if data.parent_id is not None:
+            criteria = criteria | (Category.id == data.parent_id)
+        result = await self._session.execute(select(Category).where(criteria))
 
-        # Resolve parent
         parent: Category | None = None
+        for found in result.scalars():
+            if found.code == data.code:
+                raise ConflictException(f"Category code '{data.code}' already exists")
+            parent = found
         if data.parent_id is not None:
-            parent = await self._get_category_or_404(data.parent_id)
+            if parent is None:
+                raise NotFoundException(f"Category {data.parent_id} not found")
+            self._category_cache[parent.id] = parent
 
         path = f"{parent.path}.{data.code}" if parent else data.code
         level = (parent.level + 1) if parent else 0
 
+        # Client-side id so the closure rows can be built before the INSERT
         category = Category(
+            id=uuid.uuid4(),
             code=data.code,
             impa_prefix=data.impa_prefix,
             name=data.name,
@@ -64,27 +151,33 @@ class CategoryService:
             display_order=data.display_order,
             status=CategoryStatus.ACTIVE,
         )
-        self._session.add(category)
-        await self._session.flush()
 
-        # Populate closure table: self-reference + all ancestors
-        self._session.add(CategoryClosure(
-            ancestor_id=category.id, descendant_id=category.id, depth=0,
-        ))
+        # Populate closure table in one INSERT ... SELECT: self-reference plus
+        # every ancestor of the parent with depth incremented by 1
+        closure_rows = select(
+            literal(category.id, CategoryClosure.ancestor_id.type),
+            literal(category.id, CategoryClosure.descendant_id.type),
+            literal(0, CategoryClosure.depth.type),
+        )
         if parent is not None:
-            # Copy all ancestor entries for the parent, incrementing depth by 1
-            ancestor_stmt = select(CategoryClosure).where(
-                CategoryClosure.descendant_id == parent.id
+            closure_rows = closure_rows.union_all(
+                select(
+                    CategoryClosure.ancestor_id,
+                    literal(category.id, CategoryClosure.descendant_id.type),
+                    CategoryClosure.depth + 1,
+                ).where(CategoryClosure.descendant_id == parent.id)
             )
-            result = await self._session.execute(ancestor_stmt)
-            for closure in result.scalars().all():
-                self._session.add(CategoryClosure(
-                    ancestor_id=closure.ancestor_id,
-                    descendant_id=category.id,
-                    depth=closure.depth + 1,
-                ))
 
+        # The single flush writes the category row ahead of its closure rows
+        self._session.add(category)
         await self._session.flush()
+        await self._session.execute(
+            insert(CategoryClosure).from_select(
+                ["ancestor_id", "descendant_id", "depth"], closure_rows
+            )
+        )
+        if category.impa_prefix is not None:
+            _category_prefix_cache.pop(category.impa_prefix, None)
         return category
 
     async def get_category(self, category_id: uuid.UUID) -> Category:
@@ -92,10 +185,14 @@ class CategoryService:
 
     async def update_category(self, category_id: uuid.UUID, data: CategoryUpdate) -> Category:
         category = await self._get_category_or_404(category_id)
+        old_prefix = category.impa_prefix
         update_data = data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(category, field, value)
         await self._session.flush()
+        self._category_cache.pop(category_id, None)
+        for prefix in {old_prefix, category.impa_prefix} - {None}:
+            _category_prefix_cache.pop(prefix, None)
         return category
 
     # ------------------------------------------------------------------
@@ -111,91 +208,115 @@ class CategoryService:
 
         If *root_id* is given, returns the subtree rooted at that category.
         """
-        # Subquery: direct children count per category
-        children_sub = (
-            select(
-                CategoryClosure.ancestor_id.label("cat_id"),
-                func.count().label("children_count"),
-            )
-            .where(CategoryClosure.depth == 1)
-            .group_by(CategoryClosure.ancestor_id)
-            .subquery()
+        # Correlated counts are evaluated only for the returned rows, so a
+        # subtree request no longer aggregates the whole closure/product tables
+        child_link = aliased(CategoryClosure, name="child_link")
+        children_count = (
+            select(func.count())
+            .select_from(child_link)
+            .where(child_link.ancestor_id == Category.id, child_link.depth == 1)
+            .correlate(Category)
+            .scalar_subquery()
         )
-
-        # Subquery: product count per category
-        product_sub = (
-            select(
-                Product.category_id.label("cat_id"),
-                func.count().label("product_count"),
-            )
-            .group_by(Product.category_id)
-            .subquery()
+        product_count = (
+            select(func.count())
+            .select_from(Product)
+            .where(Product.category_id == Category.id)
+            .correlate(Category)
+            .scalar_subquery()
         )
 
-        stmt = (
-            select(
-                Category,
-                func.coalesce(children_sub.c.children_count, 0).label("children_count"),
-                func.coalesce(product_sub.c.product_count, 0).label("product_count"),
-            )
-            .outerjoin(children_sub, children_sub.c.cat_id == Category.id)
-            .outerjoin(product_sub, product_sub.c.cat_id == Category.id)
+        stmt = select(
+            Category,
+            children_count.label("children_count"),
+            product_count.label("product_count"),
         )
 
         if root_id is not None:
-            descendant_ids = (
-                select(CategoryClosure.descendant_id)
-                .where(CategoryClosure.ancestor_id == root_id)
+            # Scope to the subtree first via the closure table
+            scope = aliased(CategoryClosure, name="scope")
+            stmt = stmt.join(scope, scope.descendant_id == Category.id).where(
+                scope.ancestor_id == root_id
             )
             if max_depth is not None:
-                descendant_ids = descendant_ids.where(CategoryClosure.depth <= max_depth)
-            stmt = stmt.where(Category.id.in_(descendant_ids))
+                stmt = stmt.where(scope.depth <= max_depth)
         else:
             if max_depth is not None:
                 stmt = stmt.where(Category.level <= max_depth)
 
         stmt = stmt.order_by(Category.level, Category.display_order, Category.name)
-        result = await self._session.execute(stmt)
-        rows = result.all()
+        # Stream in batches so a full-catalog tree never holds every ORM row at once
+        result = await self._session.stream(
+            stmt.execution_options(yield_per=CATEGORY_TREE_YIELD_PER)
+        )
+        return [self._to_tree_node(row) async for row in result.mappings()]
 
-        return [
-            CategoryTreeNode(
-                id=cat.id,
-                code=cat.code,
-                name=cat.name,
-                path=cat.path,
-                level=cat.level,
-                icon=cat.icon,
-                display_order=cat.display_order,
-                status=cat.status,
-                children_count=children_count,
-                product_count=product_count,
+    async def get_tree_by_path(
+        self,
+        root_id: uuid.UUID,
+        max_depth: int | None = None,
+    ) -> list[CategoryTreeNode]:
+        """Return the same subtree as :meth:`get_tree`, resolved from ``Category.path``.
+
+        Walks the materialised ltree path (served by ``idx_categories_path_gist``)
+        instead of the closure table, so it stays correct if closure rows are
+        stale and can be used to cross-check them.
+        """
+        root = await self._get_category_or_404(root_id)
+
+        child = aliased(Category, name="child")
+        children_count = (
+            select(func.count())
+            .select_from(child)
+            .where(
+                child.level == Category.level + 1,
+                _as_ltree(child.path).op("<@")(_as_ltree(Category.path)),
             )
-            for cat, children_count, product_count in rows
-        ]
+            .correlate(Category)
+            .scalar_subquery()
+        )
+        product_count = (
+            select(func.count())
+            .select_from(Product)
+            .where(Product.category_id == Category.id)
+            .correlate(Category)
+            .scalar_subquery()
+        )
+
+        stmt = select(
+            Category,
+            children_count.label("children_count"),
+            product_count.label("product_count"),
+        ).where(_as_ltree(Category.path).op("<@")(_as_ltree(literal(root.path))))
+        if max_depth is not None:
+            stmt = stmt.where(Category.level <= root.level + max_depth)
+
+        stmt = stmt.order_by(Category.level, Category.display_order, Category.name)
+        result = await self._session.execute(stmt)
+        return [self._to_tree_node(row) for row in result.mappings()]
 
     async def get_breadcrumbs(self, category_id: uuid.UUID) -> list[CategoryBreadcrumb]:
         """Return ancestor chain ordered from root to the given category."""
-        stmt = (
-            select(Category)
+        # Project only the breadcrumb columns rather than full Category rows
+        stmt = lambda_stmt(
+            lambda: select(Category.id, Category.code, Category.name, Category.level)
             .join(CategoryClosure, CategoryClosure.ancestor_id == Category.id)
             .where(CategoryClosure.descendant_id == category_id)
             .order_by(CategoryClosure.depth.desc())
         )
         result = await self._session.execute(stmt)
-        categories = result.scalars().all()
-        if not categories:
+        rows = result.all()
+        if not rows:
             raise NotFoundException(f"Category {category_id} not found")
         return [
-            CategoryBreadcrumb(id=c.id, code=c.code, name=c.name, level=c.level)
-            for c in categories
+            CategoryBreadcrumb(id=r.id, code=r.code, name=r.name, level=r.level)
+            for r in rows
         ]
 
     async def get_children(self, category_id: uuid.UUID) -> list[Category]:
         """Direct children of the given category (depth=1 in closure table)."""
-        await self._get_category_or_404(category_id)
-        stmt = (
-            select(Category)
+        stmt = lambda_stmt(
+            lambda: select(Category)
             .join(CategoryClosure, CategoryClosure.descendant_id == Category.id)
             .where(
                 CategoryClosure.ancestor_id == category_id,
@@ -204,24 +325,19 @@ class CategoryService:
             .order_by(Category.display_order, Category.name)
         )
         result = await self._session.execute(stmt)
-        return list(result.scalars().all())
+        children = list(result.scalars().all())
+        if not children:
+            # Only a leaf or a missing category yields no rows; tell them apart
+            await self._get_category_or_404(category_id)
+        return children
 
     async def move_subtree(self, category_id: uuid.UUID, new_parent_id: uuid.UUID | None) -> Category:
         """Move a category subtree to a new parent, updating paths and closure entries."""
-        category = await self._get_category_or_404(category_id)
-
-        new_parent: Category | None = None
-        if new_parent_id is not None:
-            new_parent = await self._get_category_or_404(new_parent_id)
-            # Prevent moving under own descendant
-            is_descendant = await self._session.execute(
-                select(CategoryClosure.ancestor_id).where(
-                    CategoryClosure.ancestor_id == category_id,
-                    CategoryClosure.descendant_id == new_parent_id,
-                )
-            )
-            if is_descendant.scalar_one_or_none() is not None:
-                raise ValidationException("Cannot move a category under its own descendant")
+        if new_parent_id is None:
+            category = await self._get_category_or_404(category_id)
+            new_parent: Category | None = None
+        else:
+            category, new_parent = await self._get_categories_or_404(category_id, new_parent_id)
 
         # Get all descendant IDs (including self)
         desc_stmt = select(CategoryClosure.descendant_id).where(
@@ -230,6 +346,10 @@ class CategoryService:
         desc_result = await self._session.execute(desc_stmt)
         descendant_ids = [row[0] for row in desc_result.all()]
 
+        # Prevent moving under own descendant
+        if new_parent_id is not None and new_parent_id in descendant_ids:
+            raise ValidationException("Cannot move a category under its own descendant")
+
         # Bulk delete: remove all closure entries where descendant is in subtree
         # and ancestor is NOT in subtree (i.e., external ancestor links)
         await self._session.execute(
@@ -239,35 +359,28 @@ class CategoryService:
             )
         )
 
-        # Bulk insert new ancestor links
+        # Re-link the subtree under the new parent in one INSERT ... SELECT:
+        # every ancestor of the new parent x every node of the subtree.  The
+        # rows are generated server-side, so nothing crosses the wire to COPY.
         if new_parent is not None:
-            # Get all ancestors of new_parent (including self-ref)
-            ancestor_stmt = select(CategoryClosure).where(
-                CategoryClosure.descendant_id == new_parent_id
-            )
-            ancestor_result = await self._session.execute(ancestor_stmt)
-            parent_closures = ancestor_result.scalars().all()
-
-            # Get relative depths of all descendants in one query
-            rel_stmt = select(
-                CategoryClosure.descendant_id, CategoryClosure.depth
-            ).where(
-                CategoryClosure.ancestor_id == category_id,
-                CategoryClosure.descendant_id.in_(descendant_ids),
+            parent_link = aliased(CategoryClosure, name="parent_link")
+            subtree_link = aliased(CategoryClosure, name="subtree_link")
+            await self._session.execute(
+                insert(CategoryClosure).from_select(
+                    ["ancestor_id", "descendant_id", "depth"],
+                    select(
+                        parent_link.ancestor_id,
+                        subtree_link.descendant_id,
+                        parent_link.depth + 1 + subtree_link.depth,
+                    )
+                    .select_from(parent_link)
+                    .join(subtree_link, true())
+                    .where(
+                        parent_link.descendant_id == new_parent_id,
+                        subtree_link.ancestor_id == category_id,
+                    ),
+                )
             )
-            rel_result = await self._session.execute(rel_stmt)
-            relative_depths = {row[0]: row[1] for row in rel_result.all()}
-
-            new_closures = []
-            for d_id in descendant_ids:
-                relative_depth = relative_depths.get(d_id, 0)
-                for pc in parent_closures:
-                    new_closures.append(CategoryClosure(
-                        ancestor_id=pc.ancestor_id,
-                        descendant_id=d_id,
-                        depth=pc.depth + 1 + relative_depth,
-                    ))
-            self._session.add_all(new_closures)
 
         # Bulk update paths and levels using SQL
         old_path_prefix = category.path
@@ -276,46 +389,76 @@ class CategoryService:
         new_level = (new_parent.level + 1) if new_parent else 0
         level_diff = new_level - old_level
 
-        # Use SQL concat/replace for path update and arithmetic for level
-        await self._session.execute(
+        # Use SQL regexp_replace for path update and arithmetic for level;
+        # RETURNING repopulates the moved rows instead of a follow-up refresh
+        result = await self._session.execute(
             update(Category)
             .where(Category.id.in_(descendant_ids))
             .values(
-                path=func.concat(
-                    new_path_prefix,
-                    func.substring(Category.path, len(old_path_prefix) + 1),
+                # Rewrite only a prefix that ends on a label boundary
+                path=func.regexp_replace(
+                    Category.path,
+                    literal(rf"^{re.escape(old_path_prefix)}(\.|$)"),
+                    literal(rf"{new_path_prefix}\1"),
                 ),
                 level=Category.level + level_diff,
             )
+            .returning(Category)
+            .execution_options(synchronize_session=False, populate_existing=True)
         )
+        moved = next(c for c in result.scalars().all() if c.id == category_id)
 
-        await self._session.flush()
-
-        # Refresh the moved category to return updated state
-        await self._session.refresh(category)
-        return category
+        # Paths/levels of the whole subtree changed in SQL
+        self._category_cache.clear()
+        return moved
 
     # ------------------------------------------------------------------
     # Mapping
     # ------------------------------------------------------------------
 
     async def resolve_category_by_impa_prefix(self, prefix: str) -> Category | None:
-        stmt = (
-            select(Category)
+        cached = _impa_prefix_cache.get(prefix, _CACHE_MISS)
+        if cached is not _CACHE_MISS:
+            return await self._get_cached_category(cached)
+
+        stmt = lambda_stmt(
+            lambda: select(Category)
             .join(ImpaCategoryMapping, ImpaCategoryMapping.internal_category_id == Category.id)
             .where(ImpaCategoryMapping.impa_prefix == prefix)
         )
         result = await self._session.execute(stmt)
-        return result.scalar_one_or_none()
+        category = result.scalar_one_or_none()
+        _impa_prefix_cache[prefix] = category.id if category is not None else None
+        return category
 
     async def resolve_category_by_issa_prefix(self, prefix: str) -> Category | None:
-        stmt = (
-            select(Category)
+        cached = _issa_prefix_cache.get(prefix, _CACHE_MISS)
+        if cached is not _CACHE_MISS:
+            return await self._get_cached_category(cached)
+
+        stmt = lambda_stmt(
+            lambda: select(Category)
             .join(IssaCategoryMapping, IssaCategoryMapping.internal_category_id == Category.id)
             .where(IssaCategoryMapping.issa_prefix == prefix)
         )
         result = await self._session.execute(stmt)
-        return result.scalar_one_or_none()
+        category = result.scalar_one_or_none()
+        _issa_prefix_cache[prefix] = category.id if category is not None else None
+        return category
+
+    async def suggest_category_for_impa_prefix(self, prefix: str) -> tuple[uuid.UUID, str] | None:
+        """Return ``(id, name)`` of the category whose own ``impa_prefix`` is *prefix*."""
+        cached = _category_prefix_cache.get(prefix, _CACHE_MISS)
+        if cached is not _CACHE_MISS:
+            return cached
+
+        stmt = lambda_stmt(
+            lambda: select(Category.id, Category.name).where(Category.impa_prefix == prefix)
+        )
+        row = (await self._session.execute(stmt)).one_or_none()
+        suggestion = (row.id, row.name) if row is not None else None
+        _category_prefix_cache[prefix] = suggestion
+        return suggestion
 
     async def list_impa_mappings(self) -> list[ImpaCategoryMapping]:
         result = await self._session.execute(select(ImpaCategoryMapping))
@@ -326,122 +469,169 @@ class CategoryService:
         return list(result.scalars().all())
 
     async def upsert_impa_mapping(self, data: ImpaMappingCreate, user_id: uuid.UUID | None = None) -> ImpaCategoryMapping:
-        result = await self._session.execute(
-            select(ImpaCategoryMapping).where(ImpaCategoryMapping.impa_prefix == data.impa_prefix)
+        values = {
+            "impa_category_name": data.impa_category_name,
+            "internal_category_id": data.internal_category_id,
+            "mapping_confidence": data.mapping_confidence,
+            "notes": data.notes,
+            "last_verified": datetime.now(timezone.utc),
+            "verified_by_id": user_id,
+        }
+        stmt = (
+            pg_insert(ImpaCategoryMapping)
+            .values(impa_prefix=data.impa_prefix, **values)
+            .on_conflict_do_update(index_elements=[ImpaCategoryMapping.impa_prefix], set_=values)
+            .returning(ImpaCategoryMapping)
+            .execution_options(populate_existing=True)
         )
-        mapping = result.scalar_one_or_none()
-        now = datetime.now(timezone.utc)
-        if mapping is not None:
-            mapping.impa_category_name = data.impa_category_name
-            mapping.internal_category_id = data.internal_category_id
-            mapping.mapping_confidence = data.mapping_confidence
-            mapping.notes = data.notes
-            mapping.last_verified = now
-            mapping.verified_by_id = user_id
-        else:
-            mapping = ImpaCategoryMapping(
-                impa_prefix=data.impa_prefix,
-                impa_category_name=data.impa_category_name,
-                internal_category_id=data.internal_category_id,
-                mapping_confidence=data.mapping_confidence,
-                notes=data.notes,
-                last_verified=now,
-                verified_by_id=user_id,
-            )
-            self._session.add(mapping)
-        await self._session.flush()
-        return mapping
+        result = await self._session.execute(stmt)
+        _impa_prefix_cache.pop(data.impa_prefix, None)
+        return result.scalar_one()
 
     async def upsert_issa_mapping(self, data: IssaMappingCreate) -> IssaCategoryMapping:
-        result = await self._session.execute(
-            select(IssaCategoryMapping).where(IssaCategoryMapping.issa_prefix == data.issa_prefix)
+        values = {
+            "issa_category_name": data.issa_category_name,
+            "internal_category_id": data.internal_category_id,
+            "impa_equivalent": data.impa_equivalent,
+            "mapping_confidence": data.mapping_confidence,
+            "notes": data.notes,
+            "last_verified": datetime.now(timezone.utc),
+        }
+        stmt = (
+            pg_insert(IssaCategoryMapping)
+            .values(issa_prefix=data.issa_prefix, **values)
+            .on_conflict_do_update(index_elements=[IssaCategoryMapping.issa_prefix], set_=values)
+            .returning(IssaCategoryMapping)
+            .execution_options(populate_existing=True)
         )
-        mapping = result.scalar_one_or_none()
-        now = datetime.now(timezone.utc)
-        if mapping is not None:
-            mapping.issa_category_name = data.issa_category_name
-            mapping.internal_category_id = data.internal_category_id
-            mapping.impa_equivalent = data.impa_equivalent
-            mapping.mapping_confidence = data.mapping_confidence
-            mapping.notes = data.notes
-            mapping.last_verified = now
-        else:
-            mapping = IssaCategoryMapping(
-                issa_prefix=data.issa_prefix,
-                issa_category_name=data.issa_category_name,
-                internal_category_id=data.internal_category_id,
-                impa_equivalent=data.impa_equivalent,
-                mapping_confidence=data.mapping_confidence,
-                notes=data.notes,
-                last_verified=now,
-            )
-            self._session.add(mapping)
-        await self._session.flush()
-        return mapping
+        result = await self._session.execute(stmt)
+        _issa_prefix_cache.pop(data.issa_prefix, None)
+        return result.scalar_one()
 
     # ------------------------------------------------------------------
     # Schema Inheritance
     # ------------------------------------------------------------------
 
     async def get_effective_schema(self, category_id: uuid.UUID) -> dict | None:
-        """Walk ancestors via CategoryClosure to find the nearest ACTIVE schema.
+        """Find the nearest ACTIVE schema among the category and its ancestors.
 
         Starting from the category itself, then moving up to its parent, grandparent,
         etc.  Returns the schema_json dict of the nearest ancestor with an ACTIVE
-        CategorySchema, or None if no ancestor has one.
+        CategorySchema, or None if no ancestor has one.  Resolved in a single
+        query by joining CategoryClosure to CategorySchema ordered by depth.
         """
-        await self._get_category_or_404(category_id)
+        return await self._nearest_active_schema(category_id, CategorySchema.schema_json)
 
-        # Get all ancestors ordered by depth ascending (self first, root last)
-        stmt = (
-            select(CategoryClosure.ancestor_id)
-            .where(CategoryClosure.descendant_id == category_id)
-            .order_by(CategoryClosure.depth.asc())
-        )
-        result = await self._session.execute(stmt)
-        ancestor_ids = [row[0] for row in result.all()]
-
-        if not ancestor_ids:
-            return None
+    async def get_effective_schema_id(self, category_id: uuid.UUID) -> uuid.UUID | None:
+        """Like get_effective_schema, but return the CategorySchema id only.
 
-        # For each ancestor (self -> parent -> grandparent -> ...),
-        # check for an ACTIVE schema.
-        for ancestor_id in ancestor_ids:
-            schema_stmt = (
-                select(CategorySchema)
-                .where(
-                    CategorySchema.category_id == ancestor_id,
-                    CategorySchema.status == SchemaStatus.ACTIVE,
-                )
-            )
-            schema_result = await self._session.execute(schema_stmt)
-            active_schema = schema_result.scalar_one_or_none()
-            if active_schema is not None:
-                return active_schema.schema_json
+        Lets callers that cache per schema version skip fetching the JSON body.
+        """
+        return await self._nearest_active_schema(category_id, CategorySchema.id)
 
-        return None
+    async def _nearest_active_schema(
+        self, category_id: uuid.UUID, column: ColumnElement[Any]
+    ) -> Any | None:
+        result = await self._session.execute(nearest_active_schema_select(column, category_id))
+        value = result.scalar_one_or_none()
+        if value is None:
+            await self._get_category_or_404(category_id)
+        return value
 
     # ------------------------------------------------------------------
     # Stats
     # ------------------------------------------------------------------
 
-    async def count_products_in_subtree(self, category_id: uuid.UUID) -> int:
-        """Count products in the category and all its descendants."""
+    async def count_products_in_subtree(
+        self,
+        category_id: uuid.UUID,
+        budget: int = PRODUCT_COUNT_ESTIMATE_BUDGET,
+    ) -> tuple[int, bool]:
+        """Count products in the category and all its descendants.
+
+        Returns ``(count, is_estimate)``.  One round trip counts at most
+        ``budget + 1`` matching rows and checks that the category exists; only
+        when the cap is hit is the planner's row estimate fetched and returned
+        instead of an exact ``count(*)`` over a large subtree.
+        """
         descendant_ids = select(CategoryClosure.descendant_id).where(
             CategoryClosure.ancestor_id == category_id
         )
-        stmt = select(func.count()).select_from(Product).where(
-            Product.category_id.in_(descendant_ids)
+        capped = (
+            select(literal(1))
+            .select_from(Product)
+            .where(Product.category_id.in_(descendant_ids))
+            .limit(budget + 1)
+            .subquery()
+        )
+        stmt = select(
+            select(func.count()).select_from(capped).scalar_subquery().label("count"),
+            exists().where(Category.id == category_id).label("category_exists"),
         )
-        result = await self._session.execute(stmt)
-        return result.scalar() or 0
+        row = (await self._session.execute(stmt)).one()
+        if not row.category_exists:
+            raise NotFoundException(f"Category {category_id} not found")
+        if row.count <= budget:
+            return row.count, False
+
+        plan_result = await self._session.execute(
+            _SUBTREE_PRODUCTS_EXPLAIN, {"category_id": category_id}
+        )
+        plan = plan_result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimated_rows = int(plan[0]["Plan"]["Plan Rows"])
+        return max(estimated_rows, row.count), True
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _to_tree_node(row: RowMapping) -> CategoryTreeNode:
+        cat = row["Category"]
+        return CategoryTreeNode(
+            id=cat.id,
+            code=cat.code,
+            name=cat.name,
+            path=cat.path,
+            level=cat.level,
+            icon=cat.icon,
+            display_order=cat.display_order,
+            status=cat.status,
+            children_count=row["children_count"],
+            product_count=row["product_count"],
+        )
+
     async def _get_category_or_404(self, category_id: uuid.UUID) -> Category:
+        category = self._category_cache.get(category_id)
+        if category is not None:
+            return category
         category = await self._session.get(Category, category_id)
         if category is None:
             raise NotFoundException(f"Category {category_id} not found")
+        self._category_cache[category_id] = category
+        return category
+
+    async def _get_categories_or_404(self, *category_ids: uuid.UUID) -> list[Category]:
+        """Load several categories in one query, in argument order."""
+        missing = [cid for cid in category_ids if cid not in self._category_cache]
+        if missing:
+            result = await self._session.execute(
+                select(Category).where(Category.id.in_(missing))
+            )
+            for category in result.scalars():
+                self._category_cache[category.id] = category
+        for category_id in category_ids:
+            if category_id not in self._category_cache:
+                raise NotFoundException(f"Category {category_id} not found")
+        return [self._category_cache[cid] for cid in category_ids]
+
+    async def _get_cached_category(self, category_id: uuid.UUID | None) -> Category | None:
+        """Load a category resolved from a prefix cache (identity map first)."""
+        if category_id is None:
+            return None
+        category = self._category_cache.get(category_id)
+        if category is None:
+            category = await self._session.get(Category, category_id)
         return category
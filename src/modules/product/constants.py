@@ -12,3 +12,19 @@ IMPA_PREFIX_LENGTH = 2
 
 # Maximum length of an IMPA code (EXT-XXXXXX = 10 chars)
 IMPA_CODE_MAX_LENGTH = 10
+
+# Subtree product counts above this planner estimate are returned as estimates
+PRODUCT_COUNT_ESTIMATE_BUDGET = 5000
+
+# Collections GET /products/{id} can embed; all of them unless ?include= narrows it
+PRODUCT_DETAIL_INCLUDES = frozenset({"supplier_products", "translations", "tags"})
+
+# Rows buffered per fetch when streaming the category tree
+CATEGORY_TREE_YIELD_PER = 500
+
+# Redis cache for caller-invariant reference data (mappings, units)
+REFERENCE_CACHE_PREFIX = "reference"
+REFERENCE_CACHE_TTL = 300  # seconds
+IMPA_MAPPINGS_CACHE_KEY = "impa_mappings"
+ISSA_MAPPINGS_CACHE_KEY = "issa_mappings"
+UNITS_CACHE_KEY = "units"
@@ -0,0 +1,64 @@
+"""Redis cache for global catalog reference data (IMPA/ISSA mappings, units)."""
+
+import json
+import logging
+from typing import Any
+
+import redis.asyncio as redis
+
+from src.config import settings
+from src.modules.product.constants import REFERENCE_CACHE_PREFIX, REFERENCE_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceCache:
+    """Redis-backed cache for responses that are the same for every caller.
+
+    Keys are prefixed with "reference:" and carry no user or tenant
+    component, so only cache data that is identical across organizations.
+    Redis failures are logged and treated as cache misses so the endpoint
+    falls back to the database.
+    """
+
+    def __init__(self, redis_client: redis.Redis | None = None) -> None:
+        self._redis = redis_client
+
+    async def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(settings.redis_url, decode_responses=True)
+        return self._redis
+
+    def _make_key(self, key: str) -> str:
+        return f"{REFERENCE_CACHE_PREFIX}:{key}"
+
+    async def get(self, key: str) -> Any | None:
+        """Return the cached value for *key*, or None on a miss."""
+        try:
+            client = await self._get_redis()
+            raw = await client.get(self._make_key(key))
+        except redis.RedisError:
+            logger.warning("Reference cache read failed for %s", key, exc_info=True)
+            return None
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: int = REFERENCE_CACHE_TTL) -> None:
+        """Cache a JSON-serialisable value with a TTL (in seconds)."""
+        try:
+            client = await self._get_redis()
+            await client.set(self._make_key(key), json.dumps(value, default=str), ex=ttl)
+        except redis.RedisError:
+            logger.warning("Reference cache write failed for %s", key, exc_info=True)
+
+    async def invalidate(self, key: str) -> None:
+        """Drop the cached value for *key*."""
+        try:
+            client = await self._get_redis()
+            await client.delete(self._make_key(key))
+        except redis.RedisError:
+            logger.warning("Reference cache invalidation failed for %s", key, exc_info=True)
+
+
+reference_cache = ReferenceCache()
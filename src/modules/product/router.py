@@ -5,13 +5,21 @@ from __future__ import annotations
 import uuid
 
 from fastapi import APIRouter, Depends, Path, Query, Request
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app import limiter
-from src.database.session import get_db
+from src.database.session import get_db, get_readonly_db
 from src.exceptions import ValidationException
 from src.models.enums import UnitType
 from src.modules.product.category_service import CategoryService
+from src.modules.product.constants import (
+    IMPA_MAPPINGS_CACHE_KEY,
+    ISSA_MAPPINGS_CACHE_KEY,
+    PRODUCT_DETAIL_INCLUDES,
+    UNITS_CACHE_KEY,
+)
+from src.modules.product.reference_cache import reference_cache
 from src.modules.product.schemas import (
     CategoryBreadcrumb,
     CategoryCreate,
@@ -32,10 +40,12 @@ from src.modules.product.schemas import (
     IssaMappingCreate,
     IssaMappingResponse,
     ProductCreate,
+    ProductDetailInclude,
     ProductDetailResponse,
     ProductListResponse,
     ProductResponse,
     ProductUpdate,
+    SchemaHistoryItemResponse,
     SchemaHistoryResponse,
     SpecsValidationResponse,
     SupplierPriceCreate,
@@ -52,8 +62,9 @@ from src.modules.product.schemas import (
 from src.modules.product.schema_registry import SchemaRegistryService
 from src.modules.product.service import ProductService
 from src.modules.product.unit_service import UnitConversionService
-from src.modules.product.validators import validate_specifications_with_schema
+from src.modules.product.validators import validate_product_specifications
 from src.modules.tenancy.auth import AuthenticatedUser, get_current_user
+from src.schemas.construct import construct_from_orm
 
 
 # ====================================================================
@@ -96,13 +107,15 @@ async def list_products(
         limit=limit,
         offset=offset,
     )
-    items = []
-    for p in products:
-        resp = ProductResponse.model_validate(p)
-        if p.category is not None:
-            resp.category_name = p.category.name
-        items.append(resp)
-    return ProductListResponse(
+    items = [
+        construct_from_orm(
+            ProductResponse,
+            p,
+            category_name=p.category.name if p.category is not None else None,
+        )
+        for p in products
+    ]
+    return ProductListResponse.model_construct(
         items=items,
         total=total,
         limit=limit,
@@ -142,18 +155,32 @@ async def get_product_by_impa(
 async def get_product(
     request: Request,
     product_id: uuid.UUID,
+    include: list[ProductDetailInclude] | None = Query(
+        None, description="Collections to embed; all of them when omitted"
+    ),
     db: AsyncSession = Depends(get_db),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> ProductDetailResponse:
+    included = PRODUCT_DETAIL_INCLUDES if include is None else frozenset(include)
     svc = ProductService(db)
-    product = await svc.get_product_detail(product_id)
-    resp = ProductDetailResponse.model_validate(product)
-    if product.category is not None:
-        resp.category_name = product.category.name
-    resp.tags = [
-        CategoryTagResponse.model_validate(t) for t in product.product_category_tags
-    ]
-    return resp
+    product = await svc.get_product_detail(product_id, include=included)
+    return construct_from_orm(
+        ProductDetailResponse,
+        product,
+        category_name=product.category.name if product.category is not None else None,
+        supplier_products=(
+            [construct_from_orm(SupplierProductResponse, sp) for sp in product.supplier_products]
+            if "supplier_products" in included else None
+        ),
+        translations=(
+            [construct_from_orm(TranslationResponse, t) for t in product.translations]
+            if "translations" in included else None
+        ),
+        tags=(
+            [construct_from_orm(CategoryTagResponse, t) for t in product.product_category_tags]
+            if "tags" in included else None
+        ),
+    )
 
 
 @product_router.patch("/{product_id}", response_model=ProductResponse)
@@ -353,6 +380,24 @@ async def get_translations(
 category_router = APIRouter(prefix="/categories", tags=["categories"])
 
 
+async def _get_category_service(db: AsyncSession = Depends(get_db)) -> CategoryService:
+    return CategoryService(db)
+
+
+async def _get_category_reader(db: AsyncSession = Depends(get_readonly_db)) -> CategoryService:
+    return CategoryService(db)
+
+
+async def _get_schema_registry(db: AsyncSession = Depends(get_db)) -> SchemaRegistryService:
+    return SchemaRegistryService(db)
+
+
+# Built once; dump a whole response list to JSON-safe data for the reference cache
+_impa_mappings_adapter = TypeAdapter(list[ImpaMappingResponse])
+_issa_mappings_adapter = TypeAdapter(list[IssaMappingResponse])
+_units_adapter = TypeAdapter(list[UnitResponse])
+
+
 # --- Static category routes FIRST (before /{category_id}) ---
 
 
@@ -360,24 +405,36 @@ category_router = APIRouter(prefix="/categories", tags=["categories"])
 @limiter.limit("120/minute")
 async def list_impa_mappings(
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    svc: CategoryService = Depends(_get_category_reader),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> list[ImpaMappingResponse]:
-    svc = CategoryService(db)
+    cached = await reference_cache.get(IMPA_MAPPINGS_CACHE_KEY)
+    if cached is not None:
+        return cached
     mappings = await svc.list_impa_mappings()
-    return [ImpaMappingResponse.model_validate(m) for m in mappings]
+    items = [construct_from_orm(ImpaMappingResponse, m) for m in mappings]
+    await reference_cache.set(
+        IMPA_MAPPINGS_CACHE_KEY, _impa_mappings_adapter.dump_python(items, mode="json"),
+    )
+    return items
 
 
 @category_router.get("/mappings/issa", response_model=list[IssaMappingResponse])
 @limiter.limit("120/minute")
 async def list_issa_mappings(
     request: Request,
-    db: AsyncSession = Depends(get_db),
+    svc: CategoryService = Depends(_get_category_reader),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> list[IssaMappingResponse]:
-    svc = CategoryService(db)
+    cached = await reference_cache.get(ISSA_MAPPINGS_CACHE_KEY)
+    if cached is not None:
+        return cached
     mappings = await svc.list_issa_mappings()
-    return [IssaMappingResponse.model_validate(m) for m in mappings]
+    items = [construct_from_orm(IssaMappingResponse, m) for m in mappings]
+    await reference_cache.set(
+        ISSA_MAPPINGS_CACHE_KEY, _issa_mappings_adapter.dump_python(items, mode="json"),
+    )
+    return items
 
 
 @category_router.get("/resolve/impa/{prefix}", response_model=CategoryResponse | None)
@@ -385,10 +442,9 @@ async def list_issa_mappings(
 async def resolve_impa_prefix(
     request: Request,
     prefix: str,
-    db: AsyncSession = Depends(get_db),
+    svc: CategoryService = Depends(_get_category_reader),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> CategoryResponse | None:
-    svc = CategoryService(db)
     category = await svc.resolve_category_by_impa_prefix(prefix)
     if category is None:
         return None
@@ -400,10 +456,9 @@ async def resolve_impa_prefix(
 async def resolve_issa_prefix(
     request: Request,
     prefix: str,
-    db: AsyncSession = Depends(get_db),
+    svc: CategoryService = Depends(_get_category_reader),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> CategoryResponse | None:
-    svc = CategoryService(db)
     category = await svc.resolve_category_by_issa_prefix(prefix)
     if category is None:
         return None
@@ -416,6 +471,7 @@ async def upsert_impa_mapping(
     request: Request,
     prefix: str,
     data: ImpaMappingCreate,
+    svc: CategoryService = Depends(_get_category_service),
     db: AsyncSession = Depends(get_db),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> ImpaMappingResponse:
@@ -423,9 +479,12 @@ async def upsert_impa_mapping(
         raise ValidationException(
             f"URL prefix '{prefix}' does not match body impa_prefix '{data.impa_prefix}'"
         )
-    svc = CategoryService(db)
     mapping = await svc.upsert_impa_mapping(data, user_id=user.id)
-    return ImpaMappingResponse.model_validate(mapping)
+    response = ImpaMappingResponse.model_validate(mapping)
+    # Commit before invalidating so a concurrent GET can't re-cache the old rows
+    await db.commit()
+    await reference_cache.invalidate(IMPA_MAPPINGS_CACHE_KEY)
+    return response
 
 
 @category_router.put("/mappings/issa/{prefix}", response_model=IssaMappingResponse)
@@ -434,6 +493,7 @@ async def upsert_issa_mapping(
     request: Request,
     prefix: str,
     data: IssaMappingCreate,
+    svc: CategoryService = Depends(_get_category_service),
     db: AsyncSession = Depends(get_db),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> IssaMappingResponse:
@@ -441,9 +501,12 @@ async def upsert_issa_mapping(
         raise ValidationException(
             f"URL prefix '{prefix}' does not match body issa_prefix '{data.issa_prefix}'"
         )
-    svc = CategoryService(db)
     mapping = await svc.upsert_issa_mapping(data)
-    return IssaMappingResponse.model_validate(mapping)
+    response = IssaMappingResponse.model_validate(mapping)
+    # Commit before invalidating so a concurrent GET can't re-cache the old rows
+    await db.commit()
+    await reference_cache.invalidate(ISSA_MAPPINGS_CACHE_KEY)
+    return response
 
 
 # --- Parameterized category routes ---
@@ -454,10 +517,9 @@ async def upsert_issa_mapping(
 async def create_category(
     request: Request,
     data: CategoryCreate,
-    db: AsyncSession = Depends(get_db),
+    svc: CategoryService = Depends(_get_category_service),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> CategoryResponse:
-    svc = CategoryService(db)
     category = await svc.create_category(data)
     return CategoryResponse.model_validate(category)
 
@@ -467,10 +529,9 @@ async def create_category(
 async def list_categories(
     request: Request,
     max_depth: int | None = Query(None, ge=0, le=20),
-    db: AsyncSession = Depends(get_db),
+    svc: CategoryService = Depends(_get_category_reader),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> list[CategoryTreeNode]:
-    svc = CategoryService(db)
     return await svc.get_tree(max_depth=max_depth)
 
 
@@ -479,10 +540,9 @@ async def list_categories(
 async def get_category(
     request: Request,
     category_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    svc: CategoryService = Depends(_get_category_reader),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> CategoryResponse:
-    svc = CategoryService(db)
     category = await svc.get_category(category_id)
     return CategoryResponse.model_validate(category)
 
@@ -493,10 +553,9 @@ async def get_category_tree(
     request: Request,
     category_id: uuid.UUID,
     max_depth: int | None = Query(None, ge=0, le=20),
-    db: AsyncSession = Depends(get_db),
+    svc: CategoryService = Depends(_get_category_reader),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> list[CategoryTreeNode]:
-    svc = CategoryService(db)
     return await svc.get_tree(root_id=category_id, max_depth=max_depth)
 
 
@@ -505,10 +564,9 @@ async def get_category_tree(
 async def get_breadcrumbs(
     request: Request,
     category_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    svc: CategoryService = Depends(_get_category_reader),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> list[CategoryBreadcrumb]:
-    svc = CategoryService(db)
     return await svc.get_breadcrumbs(category_id)
 
 
@@ -517,12 +575,11 @@ async def get_breadcrumbs(
 async def get_children(
     request: Request,
     category_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    svc: CategoryService = Depends(_get_category_reader),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> list[CategoryResponse]:
-    svc = CategoryService(db)
     children = await svc.get_children(category_id)
-    return [CategoryResponse.model_validate(c) for c in children]
+    return [construct_from_orm(CategoryResponse, c) for c in children]
 
 
 @category_router.patch("/{category_id}", response_model=CategoryResponse)
@@ -531,10 +588,9 @@ async def update_category(
     request: Request,
     category_id: uuid.UUID,
     data: CategoryUpdate,
-    db: AsyncSession = Depends(get_db),
+    svc: CategoryService = Depends(_get_category_service),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> CategoryResponse:
-    svc = CategoryService(db)
     category = await svc.update_category(category_id, data)
     return CategoryResponse.model_validate(category)
 
@@ -545,10 +601,9 @@ async def move_category(
     request: Request,
     category_id: uuid.UUID,
     data: CategoryMoveRequest,
-    db: AsyncSession = Depends(get_db),
+    svc: CategoryService = Depends(_get_category_service),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> CategoryResponse:
-    svc = CategoryService(db)
     category = await svc.move_subtree(category_id, data.new_parent_id)
     return CategoryResponse.model_validate(category)
 
@@ -568,9 +623,15 @@ async def list_units(
     db: AsyncSession = Depends(get_db),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> list[UnitResponse]:
+    cache_key = f"{UNITS_CACHE_KEY}:{unit_type.value if unit_type else 'all'}"
+    cached = await reference_cache.get(cache_key)
+    if cached is not None:
+        return cached
     svc = UnitConversionService(db)
     units = await svc.list_units(unit_type=unit_type)
-    return [UnitResponse.model_validate(u) for u in units]
+    items = [construct_from_orm(UnitResponse, u) for u in units]
+    await reference_cache.set(cache_key, _units_adapter.dump_python(items, mode="json"))
+    return items
 
 
 @unit_router.post("/convert", response_model=ConversionResult)
@@ -618,7 +679,7 @@ async def list_conversions(
     conversions = await svc.list_conversions(
         from_unit=from_unit, category_id=category_id, product_id=product_id,
     )
-    return [UnitConversionResponse.model_validate(c) for c in conversions]
+    return [construct_from_orm(UnitConversionResponse, c) for c in conversions]
 
 
 # ====================================================================
@@ -631,11 +692,10 @@ async def list_conversions(
 async def get_category_schema(
     request: Request,
     category_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    registry: SchemaRegistryService = Depends(_get_schema_registry),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> CategorySchemaResponse | None:
     """Get the currently ACTIVE schema for a category."""
-    registry = SchemaRegistryService(db)
     schema = await registry.get_active_schema(category_id)
     if schema is None:
         return None
@@ -648,18 +708,13 @@ async def register_category_schema(
     request: Request,
     category_id: uuid.UUID,
     data: CategorySchemaCreate,
-    db: AsyncSession = Depends(get_db),
+    registry: SchemaRegistryService = Depends(_get_schema_registry),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> CategorySchemaResponse:
     """Register a new schema version (DRAFT) for a category."""
-    # Verify category exists
-    cat_svc = CategoryService(db)
-    await cat_svc.get_category(category_id)
-
-    registry = SchemaRegistryService(db)
     schema = await registry.register_schema(
         category_id=category_id,
-        schema_json=data.schema_json,
+        schema_json=data.schema_definition,
         created_by_id=user.id,
     )
     return CategorySchemaResponse.model_validate(schema)
@@ -670,14 +725,14 @@ async def register_category_schema(
 async def get_schema_history(
     request: Request,
     category_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    include_body: bool = Query(False, description="Include each version's schema_json"),
+    registry: SchemaRegistryService = Depends(_get_schema_registry),
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> SchemaHistoryResponse:
     """Get schema version history for a category."""
-    registry = SchemaRegistryService(db)
-    schemas = await registry.list_schema_history(category_id)
-    return SchemaHistoryResponse(
-        items=[CategorySchemaResponse.model_validate(s) for s in schemas],
+    schemas = await registry.list_schema_history(category_id, include_body=include_body)
+    return SchemaHistoryResponse.model_construct(
+        items=[construct_from_orm(SchemaHistoryItemResponse, s) for s in schemas],
         category_id=category_id,
         total=len(schemas),
     )
@@ -692,11 +747,5 @@ async def validate_product_specs(
     user: AuthenticatedUser = Depends(get_current_user),
 ) -> SpecsValidationResponse:
     """Validate a product's specifications against the effective category schema."""
-    svc = ProductService(db)
-    product = await svc.get_product(product_id)
-    result = await validate_specifications_with_schema(
-        specs=product.specifications,
-        category_id=product.category_id,
-        session=db,
-    )
+    result = await validate_product_specifications(product_id, session=db)
     return SpecsValidationResponse(**result)
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import json
-import sys
 
 from src.exceptions import ValidationException
 
@@ -12,9 +11,18 @@ MAX_NESTING_DEPTH = 3
 MAX_SCHEMA_SIZE_BYTES = 64 * 1024  # 64 KB
 
 
+def serialize_schema(schema_json: dict) -> str:
+    """Serialize a schema with sorted keys, so equal dicts give equal strings.
+
+    Default separators are kept so the length matches what the size limit
+    has always measured.
+    """
+    return json.dumps(schema_json, sort_keys=True)
+
+
 class SchemaGovernanceService:
 
-    def validate_schema(self, schema_json: dict) -> None:
+    def validate_schema(self, schema_json: dict, serialized: str | None = None) -> None:
         """Validate a JSON Schema against governance rules.
 
         Checks:
@@ -22,13 +30,17 @@ class SchemaGovernanceService:
         - Max nesting depth of 3 levels
         - Max serialized size of 64 KB
 
+        Pass *serialized* (from serialize_schema) when the caller already has
+        it, to skip serializing the schema a second time.
         Raises ValidationException on failure.
         """
         if not isinstance(schema_json, dict):
             raise ValidationException("Schema must be a JSON object")
 
-        serialized = json.dumps(schema_json)
-        if sys.getsizeof(serialized.encode("utf-8")) > MAX_SCHEMA_SIZE_BYTES:
+        if serialized is None:
+            serialized = serialize_schema(schema_json)
+        # json.dumps escapes non-ASCII by default, so its length is the byte size
+        if len(serialized) > MAX_SCHEMA_SIZE_BYTES:
             raise ValidationException(
                 f"Schema exceeds maximum size of {MAX_SCHEMA_SIZE_BYTES // 1024} KB"
             )
@@ -54,57 +66,63 @@ class SchemaGovernanceService:
             return []
 
         breaking_changes: list[dict] = []
+        self._collect_breaking_changes(old_schema, new_schema, "", breaking_changes)
+        return breaking_changes
 
+    def _collect_breaking_changes(
+        self, old_schema: dict, new_schema: dict, prefix: str, out: list[dict]
+    ) -> None:
+        """Append breaking changes for one object level to *out* in a single pass.
+
+        Nested objects recurse with a dotted *prefix* so their changes are
+        recorded under the full path without being copied at each level.
+        """
         old_properties = old_schema.get("properties", {})
         new_properties = new_schema.get("properties", {})
-        old_required = set(old_schema.get("required", []))
-
-        # Check for removed required fields
-        for field_name in old_required:
-            if field_name in old_properties and field_name not in new_properties:
-                breaking_changes.append({
-                    "field": field_name,
-                    "reason": "Required field removed",
-                })
+        old_required = frozenset(old_schema.get("required", ()))
 
-        # Check for type changes on existing properties
         for field_name, old_prop in old_properties.items():
             if field_name not in new_properties:
+                if field_name in old_required:
+                    out.append({
+                        "field": prefix + field_name,
+                        "reason": "Required field removed",
+                    })
                 continue
+
             new_prop = new_properties[field_name]
             old_type = old_prop.get("type")
             new_type = new_prop.get("type")
             if old_type is not None and new_type is not None and old_type != new_type:
-                breaking_changes.append({
-                    "field": field_name,
+                out.append({
+                    "field": prefix + field_name,
                     "reason": f"Type changed from '{old_type}' to '{new_type}'",
                 })
-
-            # Recurse into nested object properties
-            if old_type == "object" and new_type == "object":
-                nested_breaks = self.detect_breaking_changes(old_prop, new_prop)
-                for change in nested_breaks:
-                    breaking_changes.append({
-                        "field": f"{field_name}.{change['field']}",
-                        "reason": change["reason"],
-                    })
-
-        return breaking_changes
-
-    def _measure_nesting_depth(self, schema: dict, current_depth: int = 0) -> int:
-        """Recursively measure the deepest nesting level in a JSON Schema."""
-        max_depth = current_depth
-        properties = schema.get("properties", {})
-        for prop in properties.values():
-            if not isinstance(prop, dict):
+            elif old_type == "object" and new_type == "object":
+                # Recurse into nested object properties
+                self._collect_breaking_changes(
+                    old_prop, new_prop, f"{prefix}{field_name}.", out
+                )
+
+    def _measure_nesting_depth(self, schema: dict) -> int:
+        """Measure the deepest nesting level in a JSON Schema (iterative DFS)."""
+        max_depth = 0
+        stack = [(schema, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth > max_depth:
+                max_depth = depth
+            properties = node.get("properties")
+            if not properties:
                 continue
-            prop_type = prop.get("type")
-            if prop_type == "object":
-                nested_depth = self._measure_nesting_depth(prop, current_depth + 1)
-                max_depth = max(max_depth, nested_depth)
-            elif prop_type == "array":
-                items = prop.get("items", {})
-                if isinstance(items, dict) and items.get("type") == "object":
-                    nested_depth = self._measure_nesting_depth(items, current_depth + 1)
-                    max_depth = max(max_depth, nested_depth)
+            for prop in properties.values():
+                if not isinstance(prop, dict):
+                    continue
+                prop_type = prop.get("type")
+                if prop_type == "object":
+                    stack.append((prop, depth + 1))
+                elif prop_type == "array":
+                    items = prop.get("items")
+                    if isinstance(items, dict) and items.get("type") == "object":
+                        stack.append((items, depth + 1))
         return max_depth
@@ -2,22 +2,33 @@
 
 from __future__ import annotations
 
+import hashlib
 import uuid
+from collections.abc import Sequence
 from datetime import datetime, timezone
 
-from sqlalchemy import func, select, update
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, defer
 
 from src.exceptions import BusinessRuleException, ConflictException, NotFoundException
+from src.models.category import Category
 from src.models.category_schema import CategorySchema
 from src.models.enums import SchemaStatus
-from src.modules.product.schema_governance import SchemaGovernanceService
+from src.modules.product.schema_governance import SchemaGovernanceService, serialize_schema
+
+# Stateless, so one instance is shared by every registry
+_governance = SchemaGovernanceService()
+
+
+def schema_content_hash(serialized: str) -> str:
+    """Return a 16-hex-digit hash of a schema serialized by serialize_schema."""
+    return hashlib.blake2b(serialized.encode(), digest_size=8).hexdigest()
 
 
 class SchemaRegistryService:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
-        self._governance = SchemaGovernanceService()
 
     async def get_active_schema(self, category_id: uuid.UUID) -> CategorySchema | None:
         """Return the current ACTIVE schema for a category, or None."""
@@ -41,15 +52,50 @@ class SchemaRegistryService:
 
         Auto-increments the version number, validates governance rules,
         and detects breaking changes against the current active schema.
+        Resubmitting the ACTIVE schema unchanged returns it as-is without
+        re-validating or creating a new version.
+        Raises NotFoundException if the category does not exist.
         Returns the newly created CategorySchema.
         """
+        # Serialized once: hashed here and size-checked by governance below
+        serialized = serialize_schema(schema_json)
+        content_hash = schema_content_hash(serialized)
+
+        # Category existence, current max version and the ACTIVE schema in
+        # one round trip; no row means the category does not exist
+        active = aliased(CategorySchema, name="active")
+        stmt = (
+            select(func.coalesce(func.max(CategorySchema.version), 0), active)
+            .select_from(Category)
+            .outerjoin(CategorySchema, CategorySchema.category_id == Category.id)
+            .outerjoin(
+                active,
+                (active.category_id == Category.id) & (active.status == SchemaStatus.ACTIVE),
+            )
+            .where(Category.id == category_id)
+            .group_by(Category.id, active.id)
+        )
+        result = await self._session.execute(stmt)
+        row = result.one_or_none()
+        if row is None:
+            raise NotFoundException(f"Category {category_id} not found")
+        max_version, active_schema = row
+
+        if active_schema is not None:
+            # Rows registered before content hashes existed fall back to a dict compare
+            if active_schema.content_hash is not None:
+                unchanged = active_schema.content_hash == content_hash
+            else:
+                unchanged = active_schema.schema_json == schema_json
+            if unchanged:
+                return active_schema
+
         # Validate governance rules (nesting depth, size)
-        self._governance.validate_schema(schema_json)
+        _governance.validate_schema(schema_json, serialized)
 
         # Detect breaking changes against current active schema
-        active_schema = await self.get_active_schema(category_id)
         if active_schema is not None:
-            breaking_changes = self._governance.detect_breaking_changes(
+            breaking_changes = _governance.detect_breaking_changes(
                 active_schema.schema_json, schema_json
             )
             if breaking_changes:
@@ -58,62 +104,80 @@ class SchemaRegistryService:
                     details=breaking_changes,
                 )
 
-        # Determine next version number
-        max_version_stmt = (
-            select(func.coalesce(func.max(CategorySchema.version), 0))
-            .where(CategorySchema.category_id == category_id)
-        )
-        result = await self._session.execute(max_version_stmt)
-        next_version = result.scalar() + 1
-
-        schema = CategorySchema(
-            category_id=category_id,
-            version=next_version,
-            schema_json=schema_json,
-            status=SchemaStatus.DRAFT,
-            created_by=created_by_id,
+        next_version = max_version + 1
+
+        # ORM-enabled INSERT ... RETURNING: server defaults (id, timestamps)
+        # come back on the same statement without a unit-of-work flush
+        result = await self._session.execute(
+            insert(CategorySchema)
+            .values(
+                category_id=category_id,
+                version=next_version,
+                schema_json=schema_json,
+                content_hash=content_hash,
+                status=SchemaStatus.DRAFT,
+                created_by=created_by_id,
+            )
+            .returning(CategorySchema)
         )
-        self._session.add(schema)
-        await self._session.flush()
-        return schema
+        return result.scalar_one()
 
     async def activate_schema(self, schema_id: uuid.UUID) -> CategorySchema:
         """Transition a DRAFT schema to ACTIVE.
 
         Deprecates the previously ACTIVE schema for the same category and
-        sets the activated_at timestamp.
+        sets the activated_at timestamp.  The deprecation runs first as its
+        own statement so at most one schema per category is ever ACTIVE.
         """
-        schema = await self._session.get(CategorySchema, schema_id)
-        if schema is None:
-            raise NotFoundException(f"CategorySchema {schema_id} not found")
-
-        if schema.status != SchemaStatus.DRAFT:
-            raise BusinessRuleException(
-                f"Cannot activate schema in status '{schema.status.value}'; must be DRAFT"
-            )
-
-        # Deprecate previous ACTIVE schema for this category
+        # Deprecate previous ACTIVE schema, only if the target is still a DRAFT
+        target = aliased(CategorySchema, name="target")
+        target_category_id = (
+            select(target.category_id)
+            .where(target.id == schema_id, target.status == SchemaStatus.DRAFT)
+            .scalar_subquery()
+        )
         await self._session.execute(
             update(CategorySchema)
             .where(
-                CategorySchema.category_id == schema.category_id,
+                CategorySchema.category_id == target_category_id,
                 CategorySchema.status == SchemaStatus.ACTIVE,
             )
             .values(status=SchemaStatus.DEPRECATED)
         )
 
-        schema.status = SchemaStatus.ACTIVE
-        schema.activated_at = datetime.now(timezone.utc)
+        result = await self._session.execute(
+            update(CategorySchema)
+            .where(CategorySchema.id == schema_id, CategorySchema.status == SchemaStatus.DRAFT)
+            .values(status=SchemaStatus.ACTIVE, activated_at=datetime.now(timezone.utc))
+            .returning(CategorySchema)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        schema = result.scalar_one_or_none()
+        if schema is not None:
+            return schema
+
+        # Nothing updated: tell a missing schema apart from a non-DRAFT one
+        existing = await self._session.get(CategorySchema, schema_id)
+        if existing is None:
+            raise NotFoundException(f"CategorySchema {schema_id} not found")
+        raise BusinessRuleException(
+            f"Cannot activate schema in status '{existing.status.value}'; must be DRAFT"
+        )
 
-        await self._session.flush()
-        return schema
+    async def list_schema_history(
+        self, category_id: uuid.UUID, include_body: bool = False
+    ) -> Sequence[CategorySchema]:
+        """Return all schema versions for a category, ordered by version descending.
 
-    async def list_schema_history(self, category_id: uuid.UUID) -> list[CategorySchema]:
-        """Return all schema versions for a category, ordered by version descending."""
+        Unless *include_body* is set, ``schema_json`` is not fetched and
+        raises if accessed on the returned rows.
+        """
         stmt = (
             select(CategorySchema)
             .where(CategorySchema.category_id == category_id)
             .order_by(CategorySchema.version.desc())
         )
+        if not include_body:
+            stmt = stmt.options(defer(CategorySchema.schema_json, raiseload=True))
         result = await self._session.execute(stmt)
-        return list(result.scalars().all())
+        return result.scalars().all()
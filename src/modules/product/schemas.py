@@ -1,15 +1,48 @@
-"""Pydantic request/response schemas for the product module."""
+"""Pydantic request/response schemas for the product module.
+
+Request models validate untrusted input. Response models are frozen and may
+be built with ``model_construct`` (see ``src.schemas.construct``) only from
+rows the database returned; anything else goes through ``model_validate``.
+Category tree nodes and breadcrumbs are slotted dataclasses instead: they are
+only ever built server-side, in bulk, from typed columns.
+"""
 
 from __future__ import annotations
 
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+from src.models.enums import (
+    CategoryStatus,
+    MappingConfidence,
+    SchemaStatus,
+    TagSource,
+    TagType,
+    UnitType,
+)
+from src.modules.product.constants import IMPA_CODE_MAX_LENGTH, IMPA_CODE_PATTERN, IMPA_PREFIX_LENGTH
+
+# Shared by every model that accepts a well-formed IMPA code
+ImpaCode = Annotated[str, StringConstraints(pattern=IMPA_CODE_PATTERN, max_length=IMPA_CODE_MAX_LENGTH)]
+Price = Annotated[Decimal, Field(gt=0, decimal_places=4)]
+Confidence = Annotated[Decimal, Field(ge=0, le=1)]
+ProductName = Annotated[str, StringConstraints(min_length=1, max_length=500)]
+Description = Annotated[str, StringConstraints(max_length=5000)]
+UnitCode = Annotated[str, StringConstraints(max_length=10)]
+# Two-character IMPA/ISSA category prefix; the loose form only caps the length
+CategoryPrefix = Annotated[str, StringConstraints(min_length=IMPA_PREFIX_LENGTH, max_length=IMPA_PREFIX_LENGTH)]
+LooseCategoryPrefix = Annotated[str, StringConstraints(max_length=IMPA_PREFIX_LENGTH)]
 
-from pydantic import BaseModel, ConfigDict, Field
 
-from src.models.enums import CategoryStatus, SchemaStatus, TagSource, TagType, UnitType
-from src.modules.product.constants import IMPA_CODE_PATTERN
+class _ORMResponse(BaseModel):
+    """Base for immutable response models read from ORM rows."""
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 # ---------------------------------------------------------------------------
@@ -17,10 +50,10 @@ from src.modules.product.constants import IMPA_CODE_PATTERN
 # ---------------------------------------------------------------------------
 
 class ProductCreate(BaseModel):
-    impa_code: str = Field(..., pattern=IMPA_CODE_PATTERN, max_length=10)
+    impa_code: ImpaCode
     issa_code: str | None = Field(None, max_length=20)
-    name: str = Field(..., min_length=1, max_length=500)
-    description: str | None = Field(None, max_length=5000)
+    name: ProductName
+    description: Description | None = None
     category_id: uuid.UUID
     unit_of_measure: str = Field(..., max_length=20)
     ihm_relevant: bool = False
@@ -29,10 +62,10 @@ class ProductCreate(BaseModel):
 
 
 class ProductUpdate(BaseModel):
-    impa_code: str | None = Field(None, pattern=IMPA_CODE_PATTERN, max_length=10)
+    impa_code: ImpaCode | None = None
     issa_code: str | None = None
-    name: str | None = Field(None, min_length=1, max_length=500)
-    description: str | None = Field(None, max_length=5000)
+    name: ProductName | None = None
+    description: Description | None = None
     category_id: uuid.UUID | None = None
     unit_of_measure: str | None = Field(None, max_length=20)
     ihm_relevant: bool | None = None
@@ -41,9 +74,7 @@ class ProductUpdate(BaseModel):
     version: int = Field(..., description="Expected version for optimistic locking")
 
 
-class ProductResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class ProductResponse(_ORMResponse):
     id: uuid.UUID
     impa_code: str
     issa_code: str | None
@@ -60,12 +91,6 @@ class ProductResponse(BaseModel):
     updated_at: datetime
 
 
-class ProductDetailResponse(ProductResponse):
-    supplier_products: list[SupplierProductResponse] = []
-    translations: list[TranslationResponse] = []
-    tags: list[CategoryTagResponse] = []
-
-
 class ProductListResponse(BaseModel):
     items: list[ProductResponse]
     total: int
@@ -117,9 +142,7 @@ class SupplierProductUpdate(BaseModel):
     version: int = Field(..., description="Expected version for optimistic locking")
 
 
-class SupplierProductResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class SupplierProductResponse(_ORMResponse):
     id: uuid.UUID
     product_id: uuid.UUID
     supplier_id: uuid.UUID
@@ -142,16 +165,14 @@ class SupplierProductResponse(BaseModel):
 # ---------------------------------------------------------------------------
 
 class SupplierPriceCreate(BaseModel):
-    price: Decimal = Field(..., gt=0, decimal_places=4)
+    price: Price
     currency: str = Field("USD", pattern=r"^[A-Z]{3}$", max_length=3)
     min_quantity: int = 1
     valid_from: datetime
     valid_to: datetime | None = None
 
 
-class SupplierPriceResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class SupplierPriceResponse(_ORMResponse):
     id: uuid.UUID
     supplier_product_id: uuid.UUID
     price: Decimal
@@ -168,9 +189,9 @@ class SupplierPriceResponse(BaseModel):
 
 class CategoryCreate(BaseModel):
     code: str = Field(..., min_length=1, max_length=20)
-    impa_prefix: str | None = Field(None, max_length=2)
+    impa_prefix: LooseCategoryPrefix | None = None
     name: str = Field(..., min_length=1, max_length=255)
-    description: str | None = Field(None, max_length=5000)
+    description: Description | None = None
     parent_id: uuid.UUID | None = None
     attribute_schema: dict | None = None
     ihm_category: bool = False
@@ -188,9 +209,7 @@ class CategoryUpdate(BaseModel):
     status: CategoryStatus | None = None
 
 
-class CategoryResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class CategoryResponse(_ORMResponse):
     id: uuid.UUID
     code: str
     impa_prefix: str | None
@@ -208,7 +227,8 @@ class CategoryResponse(BaseModel):
     updated_at: datetime
 
 
-class CategoryTreeNode(BaseModel):
+@dataclass(slots=True, frozen=True)
+class CategoryTreeNode:
     id: uuid.UUID
     code: str
     name: str
@@ -221,7 +241,8 @@ class CategoryTreeNode(BaseModel):
     product_count: int = 0
 
 
-class CategoryBreadcrumb(BaseModel):
+@dataclass(slots=True, frozen=True)
+class CategoryBreadcrumb:
     id: uuid.UUID
     code: str
     name: str
@@ -237,41 +258,37 @@ class CategoryMoveRequest(BaseModel):
 # ---------------------------------------------------------------------------
 
 class ImpaMappingCreate(BaseModel):
-    impa_prefix: str = Field(..., min_length=2, max_length=2)
+    impa_prefix: CategoryPrefix
     impa_category_name: str = Field(..., max_length=255)
     internal_category_id: uuid.UUID
-    mapping_confidence: str = "EXACT"
+    mapping_confidence: MappingConfidence = MappingConfidence.EXACT
     notes: str | None = None
 
 
-class ImpaMappingResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class ImpaMappingResponse(_ORMResponse):
     impa_prefix: str
     impa_category_name: str
     internal_category_id: uuid.UUID
-    mapping_confidence: str
+    mapping_confidence: MappingConfidence
     notes: str | None
     last_verified: datetime
 
 
 class IssaMappingCreate(BaseModel):
-    issa_prefix: str = Field(..., min_length=2, max_length=2)
+    issa_prefix: CategoryPrefix
     issa_category_name: str = Field(..., max_length=255)
     internal_category_id: uuid.UUID
-    impa_equivalent: str | None = Field(None, max_length=2)
-    mapping_confidence: str = "EXACT"
+    impa_equivalent: LooseCategoryPrefix | None = None
+    mapping_confidence: MappingConfidence = MappingConfidence.EXACT
     notes: str | None = None
 
 
-class IssaMappingResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class IssaMappingResponse(_ORMResponse):
     issa_prefix: str
     issa_category_name: str
     internal_category_id: uuid.UUID
     impa_equivalent: str | None
-    mapping_confidence: str
+    mapping_confidence: MappingConfidence
     notes: str | None
     last_verified: datetime
 
@@ -283,13 +300,11 @@ class IssaMappingResponse(BaseModel):
 class CategoryTagCreate(BaseModel):
     category_id: uuid.UUID
     tag_type: TagType
-    confidence: Decimal = Field(Decimal("1.0"), ge=0, le=1)
+    confidence: Confidence = Decimal("1.0")
     created_by: TagSource
 
 
-class CategoryTagResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class CategoryTagResponse(_ORMResponse):
     id: uuid.UUID
     product_id: uuid.UUID
     category_id: uuid.UUID
@@ -305,14 +320,12 @@ class CategoryTagResponse(BaseModel):
 # ---------------------------------------------------------------------------
 
 class TranslationCreate(BaseModel):
-    name: str = Field(..., min_length=1, max_length=500)
-    description: str | None = Field(None, max_length=5000)
+    name: ProductName
+    description: Description | None = None
     search_keywords: list[str] = Field(default_factory=list)
 
 
-class TranslationResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class TranslationResponse(_ORMResponse):
     id: uuid.UUID
     product_id: uuid.UUID
     locale: str
@@ -322,12 +335,25 @@ class TranslationResponse(BaseModel):
 
 
 # ---------------------------------------------------------------------------
-# Units
+# Product detail
 # ---------------------------------------------------------------------------
 
-class UnitResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
+# Declared after the nested response models so no forward-ref rebuild is needed
+ProductDetailInclude = Literal["supplier_products", "translations", "tags"]
+
+
+class ProductDetailResponse(ProductResponse):
+    # None when the collection was left out of ?include=
+    supplier_products: list[SupplierProductResponse] | None = None
+    translations: list[TranslationResponse] | None = None
+    tags: list[CategoryTagResponse] | None = None
+
+
+# ---------------------------------------------------------------------------
+# Units
+# ---------------------------------------------------------------------------
 
+class UnitResponse(_ORMResponse):
     code: str
     name: str
     unit_type: UnitType
@@ -337,8 +363,8 @@ class UnitResponse(BaseModel):
 
 class ConvertRequest(BaseModel):
     value: Decimal = Field(..., gt=0)
-    from_unit: str = Field(..., max_length=10)
-    to_unit: str = Field(..., max_length=10)
+    from_unit: UnitCode
+    to_unit: UnitCode
     category_id: uuid.UUID | None = None
     product_id: uuid.UUID | None = None
 
@@ -351,16 +377,14 @@ class ConversionResult(BaseModel):
 
 
 class UnitConversionCreate(BaseModel):
-    from_unit: str = Field(..., max_length=10)
-    to_unit: str = Field(..., max_length=10)
+    from_unit: UnitCode
+    to_unit: UnitCode
     conversion_factor: Decimal = Field(..., gt=0)
     category_id: uuid.UUID | None = None
     product_id: uuid.UUID | None = None
 
 
-class UnitConversionResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
+class UnitConversionResponse(_ORMResponse):
     id: uuid.UUID
     from_unit: str
     to_unit: str
@@ -375,14 +399,12 @@ class UnitConversionResponse(BaseModel):
 
 
 class CategorySchemaCreate(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
-
+    # "schema_json" on the wire; the attribute can't share the name because it
+    # would shadow the deprecated BaseModel.schema_json method
     schema_definition: dict = Field(..., alias="schema_json")
 
 
-class CategorySchemaResponse(BaseModel):
-    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
-
+class CategorySchemaResponse(_ORMResponse):
     id: uuid.UUID
     category_id: uuid.UUID
     version: int
@@ -393,8 +415,13 @@ class CategorySchemaResponse(BaseModel):
     activated_at: datetime | None
 
 
+class SchemaHistoryItemResponse(CategorySchemaResponse):
+    # None unless the history was requested with include_body
+    schema_definition: dict | None = Field(None, alias="schema_json")
+
+
 class SchemaHistoryResponse(BaseModel):
-    items: list[CategorySchemaResponse]
+    items: list[SchemaHistoryItemResponse]
     category_id: uuid.UUID
     total: int
 
@@ -403,7 +430,3 @@ class SpecsValidationResponse(BaseModel):
     valid: bool
     errors: list[dict] = []
     schema_source: str | None = None
-
-
-# Forward-ref rebuild for nested models
-ProductDetailResponse.model_rebuild()
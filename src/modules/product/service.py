@@ -2,25 +2,34 @@
 
 from __future__ import annotations
 
-import random
 import re
 import uuid
+from collections.abc import Collection
 from datetime import datetime, timezone
+from typing import NoReturn
 
-from sqlalchemy import func, select, update
+from sqlalchemy import Boolean, String, cast, exists, func, lambda_stmt, literal, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, raiseload, selectinload
 
 from src.exceptions import ConflictException, NotFoundException, ValidationException
 from src.models.audit import ProductAuditLog
 from src.models.category import Category
+from src.models.category_schema import CategorySchema
 from src.models.enums import CategoryStatus
-from src.models.product import Product
+from src.models.product import Product, extension_code_seq
 from src.models.product_category_tag import ProductCategoryTag
 from src.models.supplier_product import SupplierProduct, SupplierProductPrice
 from src.models.translation import ProductTranslation
 from src.models.unit import UnitOfMeasure
-from src.modules.product.constants import EXTENSION_CODE_PREFIX, IMPA_PREFIX_LENGTH
+from src.modules.product.category_service import CategoryService, nearest_active_schema_select
+from src.modules.product.constants import (
+    EXTENSION_CODE_PREFIX,
+    IMPA_PREFIX_LENGTH,
+    PRODUCT_DETAIL_INCLUDES,
+)
 from src.modules.product.schemas import (
     CategoryTagCreate,
     ImpaValidationResponse,
@@ -34,11 +43,21 @@ from src.modules.product.schemas import (
 from src.modules.product.validators import validate_impa_code_format, validate_specifications
 from src.modules.tenancy.auth import AuthenticatedUser
 
+# LIKE wildcards and the escape character itself, backslash-escaped in search terms
+_LIKE_ESCAPE_RE = re.compile(r"([%_\\])")
+
+# SQLSTATE for "nextval: reached maximum value of sequence"
+_SEQUENCE_EXHAUSTED = "2200H"
+
 
 class ProductService:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
+    # Fixed-shape per-request reads use ``lambda_stmt`` so SQLAlchemy caches
+    # the constructed statement; primary-key lookups stay on ``session.get``,
+    # which answers from the identity map without emitting SQL at all.
+
     # ------------------------------------------------------------------
     # CRUD
     # ------------------------------------------------------------------
@@ -48,35 +67,33 @@ class ProductService:
         if not validate_impa_code_format(data.impa_code):
             raise ValidationException(f"Invalid IMPA code format: {data.impa_code}")
 
-        # Check uniqueness
-        existing = await self._session.execute(
-            select(Product.id).where(Product.impa_code == data.impa_code)
-        )
-        if existing.scalar_one_or_none() is not None:
-            raise ConflictException(f"Product with IMPA code '{data.impa_code}' already exists")
-
-        # Validate category exists and is active
-        category = await self._get_active_category(data.category_id)
+        # Validate category exists and is active, and unit of measure exists
+        category = await self._get_active_category(data.category_id, data.unit_of_measure)
 
         # Validate specifications against category schema
         validate_specifications(data.specifications, category.attribute_schema)
 
-        # Validate unit of measure exists
-        await self._validate_unit(data.unit_of_measure)
-
-        product = Product(
-            impa_code=data.impa_code,
-            issa_code=data.issa_code,
-            name=data.name,
-            description=data.description,
-            category_id=data.category_id,
-            unit_of_measure=data.unit_of_measure,
-            ihm_relevant=data.ihm_relevant,
-            hazmat_class=data.hazmat_class,
-            specifications=data.specifications,
+        # The unique index on impa_code is the uniqueness check: no pre-SELECT,
+        # no window for a concurrent create to slip in between
+        stmt = (
+            pg_insert(Product)
+            .values(
+                impa_code=data.impa_code,
+                issa_code=data.issa_code,
+                name=data.name,
+                description=data.description,
+                category_id=data.category_id,
+                unit_of_measure=data.unit_of_measure,
+                ihm_relevant=data.ihm_relevant,
+                hazmat_class=data.hazmat_class,
+                specifications=data.specifications,
+            )
+            .on_conflict_do_nothing(index_elements=[Product.impa_code])
+            .returning(Product)
         )
-        self._session.add(product)
-        await self._session.flush()
+        product = (await self._session.execute(stmt)).scalar_one_or_none()
+        if product is None:
+            raise ConflictException(f"Product with IMPA code '{data.impa_code}' already exists")
 
         await self._audit_log(
             entity_type="Product",
@@ -92,15 +109,46 @@ class ProductService:
     async def get_product(self, product_id: uuid.UUID) -> Product:
         return await self._get_product_or_404(product_id)
 
-    async def get_product_detail(self, product_id: uuid.UUID) -> Product:
+    async def get_specs_with_effective_schema_id(
+        self, product_id: uuid.UUID
+    ) -> tuple[dict, uuid.UUID | None]:
+        """Return a product's specifications and the id of its effective schema.
+
+        The effective schema is the nearest ACTIVE CategorySchema at or above
+        the product's category; both are read in one query.
+        """
+        schema_id = (
+            nearest_active_schema_select(CategorySchema.id, Product.category_id)
+            .correlate(Product)
+            .scalar_subquery()
+        )
+        result = await self._session.execute(
+            select(Product.specifications, schema_id).where(Product.id == product_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise NotFoundException(f"Product {product_id} not found")
+        return row[0], row[1]
+
+    async def get_product_detail(
+        self,
+        product_id: uuid.UUID,
+        include: Collection[str] = PRODUCT_DETAIL_INCLUDES,
+    ) -> Product:
+        """Load a product with its category and the collections named in *include*.
+
+        Collections left out are not queried and raise if accessed.
+        """
+        options = [selectinload(Product.category)]
+        if "supplier_products" in include:
+            options.append(selectinload(Product.supplier_products))
+        if "translations" in include:
+            options.append(selectinload(Product.translations))
+        if "tags" in include:
+            options.append(selectinload(Product.product_category_tags))
         stmt = (
             select(Product)
-            .options(
-                selectinload(Product.supplier_products).selectinload(SupplierProduct.prices),
-                selectinload(Product.translations),
-                selectinload(Product.product_category_tags),
-                selectinload(Product.category),
-            )
+            .options(*options, raiseload("*"))
             .where(Product.id == product_id)
         )
         result = await self._session.execute(stmt)
@@ -110,7 +158,7 @@ class ProductService:
         return product
 
     async def get_product_by_impa(self, impa_code: str) -> Product:
-        stmt = select(Product).where(Product.impa_code == impa_code)
+        stmt = lambda_stmt(lambda: select(Product).where(Product.impa_code == impa_code))
         result = await self._session.execute(stmt)
         product = result.scalar_one_or_none()
         if product is None:
@@ -125,29 +173,35 @@ class ProductService:
         limit: int = 50,
         offset: int = 0,
     ) -> tuple[list[Product], int]:
-        stmt = select(Product)
-        count_stmt = select(func.count()).select_from(Product)
-
+        filters = []
         if category_id is not None:
-            stmt = stmt.where(Product.category_id == category_id)
-            count_stmt = count_stmt.where(Product.category_id == category_id)
+            filters.append(Product.category_id == category_id)
         if ihm_relevant is not None:
-            stmt = stmt.where(Product.ihm_relevant == ihm_relevant)
-            count_stmt = count_stmt.where(Product.ihm_relevant == ihm_relevant)
+            filters.append(Product.ihm_relevant == ihm_relevant)
         if search is not None:
-            escaped = re.sub(r"([%_\\])", r"\\\1", search)
+            escaped = _LIKE_ESCAPE_RE.sub(r"\\\1", search)
             like_pattern = f"%{escaped}%"
-            search_filter = Product.name.ilike(like_pattern) | Product.impa_code.ilike(like_pattern)
-            stmt = stmt.where(search_filter)
-            count_stmt = count_stmt.where(search_filter)
-
-        total_result = await self._session.execute(count_stmt)
-        total = total_result.scalar() or 0
-
-        stmt = stmt.options(selectinload(Product.category))
+            # Both sides are served by pg_trgm GIN indexes, which handle ILIKE directly
+            filters.append(Product.name.ilike(like_pattern) | Product.impa_code.ilike(like_pattern))
+
+        # The total rides along on every page row, so one query serves both
+        stmt = select(Product, func.count().over().label("total")).where(*filters)
+        # The router reads ``category.name`` for every row; anything else the
+        # response touches must be loaded explicitly rather than lazily per row.
+        stmt = stmt.options(selectinload(Product.category), raiseload("*"))
         stmt = stmt.order_by(Product.name).limit(limit).offset(offset)
         result = await self._session.execute(stmt)
-        products = list(result.scalars().all())
+        rows = result.all()
+        products = [row.Product for row in rows]
+
+        if rows:
+            total = rows[0].total
+        elif offset == 0:
+            total = 0
+        else:
+            # Paged past the end: no row carried the total, so count separately
+            count_stmt = select(func.count()).select_from(Product).where(*filters)
+            total = await self._session.scalar(count_stmt) or 0
 
         return products, total
 
@@ -167,21 +221,18 @@ class ProductService:
 
         update_data = data.model_dump(exclude_unset=True, exclude={"version"})
 
-        if "impa_code" in update_data and update_data["impa_code"] is not None:
-            if not validate_impa_code_format(update_data["impa_code"]):
-                raise ValidationException(f"Invalid IMPA code format: {update_data['impa_code']}")
-            # Check uniqueness if changing impa_code
-            if update_data["impa_code"] != product.impa_code:
-                existing = await self._session.execute(
-                    select(Product.id).where(Product.impa_code == update_data["impa_code"])
-                )
-                if existing.scalar_one_or_none() is not None:
-                    raise ConflictException(
-                        f"Product with IMPA code '{update_data['impa_code']}' already exists"
-                    )
+        new_code = update_data.get("impa_code")
+        if new_code is not None:
+            if not validate_impa_code_format(new_code):
+                raise ValidationException(f"Invalid IMPA code format: {new_code}")
+            if new_code == product.impa_code:
+                new_code = None
 
+        unit_code = update_data.get("unit_of_measure")
         if "category_id" in update_data and update_data["category_id"] is not None:
-            category = await self._get_active_category(update_data["category_id"])
+            # A new unit, if any, is checked in the same query
+            category = await self._get_active_category(update_data["category_id"], unit_code)
+            unit_code = None
             specs = update_data.get("specifications", product.specifications)
             validate_specifications(specs, category.attribute_schema)
         elif "specifications" in update_data:
@@ -189,14 +240,26 @@ class ProductService:
             if category is not None:
                 validate_specifications(update_data["specifications"], category.attribute_schema)
 
-        if "unit_of_measure" in update_data and update_data["unit_of_measure"] is not None:
-            await self._validate_unit(update_data["unit_of_measure"])
-
-        for field, value in update_data.items():
-            setattr(product, field, value)
-        product.version += 1
+        if unit_code is not None:
+            await self._validate_unit(unit_code)
 
-        await self._session.flush()
+        # The version guard and, when the IMPA code changes, its uniqueness
+        # check run inside the UPDATE itself; no separate probe, no race window
+        stmt = (
+            update(Product)
+            .where(Product.id == product_id, Product.version == data.version)
+            .values(**update_data, version=Product.version + 1)
+            .returning(Product)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        if new_code is not None:
+            taken = aliased(Product)
+            stmt = stmt.where(
+                ~exists().where(taken.impa_code == new_code, taken.id != product_id)
+            )
+        product = (await self._session.execute(stmt)).scalar_one_or_none()
+        if product is None:
+            await self._raise_update_conflict(product_id, data.version, new_code)
 
         await self._audit_log(
             entity_type="Product",
@@ -233,26 +296,26 @@ class ProductService:
         suggested_category_name = None
 
         if is_valid:
-            # Check if the code already exists
+            # Check if the code already exists; the category name comes back
+            # on the same row rather than from a second load
             existing = await self._session.execute(
-                select(Product).options(selectinload(Product.category)).where(Product.impa_code == code)
+                lambda_stmt(
+                    lambda: select(Product.category_id, Category.name)
+                    .outerjoin(Category, Category.id == Product.category_id)
+                    .where(Product.impa_code == code)
+                )
             )
-            product = existing.scalar_one_or_none()
-            if product is not None:
+            known = existing.one_or_none()
+            if known is not None:
                 is_known = True
-                suggested_category_id = product.category_id
-                if product.category is not None:
-                    suggested_category_name = product.category.name
+                suggested_category_id, suggested_category_name = known
             elif not code.startswith(EXTENSION_CODE_PREFIX) and len(code) >= IMPA_PREFIX_LENGTH:
                 # Try to suggest category based on IMPA prefix
-                prefix = code[:IMPA_PREFIX_LENGTH]
-                category = await self._session.execute(
-                    select(Category).where(Category.impa_prefix == prefix)
+                suggestion = await CategoryService(self._session).suggest_category_for_impa_prefix(
+                    code[:IMPA_PREFIX_LENGTH]
                 )
-                cat = category.scalar_one_or_none()
-                if cat is not None:
-                    suggested_category_id = cat.id
-                    suggested_category_name = cat.name
+                if suggestion is not None:
+                    suggested_category_id, suggested_category_name = suggestion
 
         return ImpaValidationResponse(
             is_valid_format=is_valid,
@@ -262,16 +325,25 @@ class ProductService:
         )
 
     async def generate_extension_code(self) -> str:
-        """Generate a unique extension code (EXT-XXXXXX)."""
-        for _ in range(100):
-            number = random.randint(100000, 999999)
-            code = f"{EXTENSION_CODE_PREFIX}{number}"
-            existing = await self._session.execute(
-                select(Product.id).where(Product.impa_code == code)
-            )
-            if existing.scalar_one_or_none() is None:
-                return code
-        raise ConflictException("Unable to generate unique extension code after 100 attempts")
+        """Allocate an extension code (EXT-XXXXXX) that no product holds yet.
+
+        Suffixes come from ``extension_code_seq``; values already taken (by the
+        old random generator or by clients supplying EXT codes) are skipped.
+        """
+        drawn = select(extension_code_seq.next_value().label("number")).cte("drawn")
+        code = literal(EXTENSION_CODE_PREFIX) + cast(drawn.c.number, String)
+        stmt = select(drawn.c.number, exists().where(Product.impa_code == code).label("taken"))
+        try:
+            # Savepoint so an exhausted sequence doesn't abort the request's transaction
+            async with self._session.begin_nested():
+                while True:
+                    row = (await self._session.execute(stmt)).one()
+                    if not row.taken:
+                        return f"{EXTENSION_CODE_PREFIX}{row.number}"
+        except DBAPIError as exc:
+            if getattr(exc.orig, "sqlstate", None) == _SEQUENCE_EXHAUSTED:
+                raise ConflictException("No unused extension codes left (EXT-100000 to EXT-999999)") from exc
+            raise
 
     # ------------------------------------------------------------------
     # Supplier Products
@@ -348,10 +420,12 @@ class ProductService:
         active_only: bool = True,
     ) -> list[SupplierProduct]:
         await self._get_product_or_404(product_id)
-        stmt = select(SupplierProduct).where(SupplierProduct.product_id == product_id)
+        stmt = lambda_stmt(
+            lambda: select(SupplierProduct).where(SupplierProduct.product_id == product_id)
+        )
         if active_only:
-            stmt = stmt.where(SupplierProduct.is_active.is_(True))
-        stmt = stmt.order_by(SupplierProduct.created_at)
+            stmt += lambda s: s.where(SupplierProduct.is_active.is_(True))
+        stmt += lambda s: s.order_by(SupplierProduct.created_at)
         result = await self._session.execute(stmt)
         return list(result.scalars().all())
 
@@ -372,8 +446,8 @@ class ProductService:
 
         # Auto-close previous open price windows for same currency/quantity
         # Only close prices whose valid_from is before the new price's valid_from
-        stmt = (
-            select(SupplierProductPrice)
+        result = await self._session.execute(
+            update(SupplierProductPrice)
             .where(
                 SupplierProductPrice.supplier_product_id == sp_id,
                 SupplierProductPrice.currency == data.currency,
@@ -381,11 +455,9 @@ class ProductService:
                 SupplierProductPrice.valid_to.is_(None),
                 SupplierProductPrice.valid_from < data.valid_from,
             )
+            .values(valid_to=data.valid_from)
         )
-        result = await self._session.execute(stmt)
-        closed_prices = list(result.scalars().all())
-        for existing_price in closed_prices:
-            existing_price.valid_to = data.valid_from
+        closed_count = result.rowcount
 
         price = SupplierProductPrice(
             supplier_product_id=sp_id,
@@ -404,7 +476,7 @@ class ProductService:
             operation="CREATE",
             changed_fields={
                 **data.model_dump(mode="json"),
-                "auto_closed_count": len(closed_prices),
+                "auto_closed_count": closed_count,
             },
             changed_by_id=user.id,
             version=1,
@@ -442,8 +514,8 @@ class ProductService:
         sp = await self._get_supplier_product_or_404(sp_id)
         if sp.product_id != product_id:
             raise NotFoundException(f"Supplier product {sp_id} not found for product {product_id}")
-        stmt = (
-            select(SupplierProductPrice)
+        stmt = lambda_stmt(
+            lambda: select(SupplierProductPrice)
             .where(SupplierProductPrice.supplier_product_id == sp_id)
             .order_by(SupplierProductPrice.valid_from.desc())
         )
@@ -500,8 +572,8 @@ class ProductService:
 
     async def get_product_tags(self, product_id: uuid.UUID) -> list[ProductCategoryTag]:
         await self._get_product_or_404(product_id)
-        stmt = (
-            select(ProductCategoryTag)
+        stmt = lambda_stmt(
+            lambda: select(ProductCategoryTag)
             .where(ProductCategoryTag.product_id == product_id)
             .order_by(ProductCategoryTag.created_at)
         )
@@ -520,30 +592,25 @@ class ProductService:
         user: AuthenticatedUser,
     ) -> ProductTranslation:
         await self._get_product_or_404(product_id)
-        stmt = select(ProductTranslation).where(
-            ProductTranslation.product_id == product_id,
-            ProductTranslation.locale == locale,
+        values = {
+            "name": data.name,
+            "description": data.description,
+            "search_keywords": data.search_keywords,
+        }
+        # One atomic round-trip; xmax is 0 only on the row version this INSERT created
+        stmt = (
+            pg_insert(ProductTranslation)
+            .values(product_id=product_id, locale=locale, **values)
+            .on_conflict_do_update(
+                index_elements=[ProductTranslation.product_id, ProductTranslation.locale],
+                set_=values,
+            )
+            .returning(ProductTranslation, literal_column("xmax = 0", Boolean).label("inserted"))
+            .execution_options(populate_existing=True)
         )
         result = await self._session.execute(stmt)
-        translation = result.scalar_one_or_none()
-
-        if translation is not None:
-            operation = "UPDATE"
-            translation.name = data.name
-            translation.description = data.description
-            translation.search_keywords = data.search_keywords
-        else:
-            operation = "CREATE"
-            translation = ProductTranslation(
-                product_id=product_id,
-                locale=locale,
-                name=data.name,
-                description=data.description,
-                search_keywords=data.search_keywords,
-            )
-            self._session.add(translation)
-
-        await self._session.flush()
+        translation, inserted = result.one()
+        operation = "CREATE" if inserted else "UPDATE"
 
         await self._audit_log(
             entity_type="ProductTranslation",
@@ -558,8 +625,8 @@ class ProductService:
 
     async def get_translations(self, product_id: uuid.UUID) -> list[ProductTranslation]:
         await self._get_product_or_404(product_id)
-        stmt = (
-            select(ProductTranslation)
+        stmt = lambda_stmt(
+            lambda: select(ProductTranslation)
             .where(ProductTranslation.product_id == product_id)
             .order_by(ProductTranslation.locale)
         )
@@ -582,12 +649,31 @@ class ProductService:
             raise NotFoundException(f"Supplier product {sp_id} not found")
         return sp
 
-    async def _get_active_category(self, category_id: uuid.UUID) -> Category:
-        category = await self._session.get(Category, category_id)
+    async def _get_active_category(
+        self, category_id: uuid.UUID, unit_code: str | None = None
+    ) -> Category:
+        """Load an ACTIVE category; with *unit_code*, also check that unit exists.
+
+        The unit check rides on the category query as an outer join, so the
+        create/update paths validate both in one round-trip.
+        """
+        unit_found: str | None = None
+        if unit_code is None:
+            category = await self._session.get(Category, category_id)
+        else:
+            stmt = lambda_stmt(
+                lambda: select(Category, UnitOfMeasure.code)
+                .outerjoin(UnitOfMeasure, UnitOfMeasure.code == unit_code)
+                .where(Category.id == category_id)
+            )
+            row = (await self._session.execute(stmt)).one_or_none()
+            category, unit_found = row if row is not None else (None, None)
         if category is None:
             raise NotFoundException(f"Category {category_id} not found")
         if category.status != CategoryStatus.ACTIVE:
             raise ValidationException(f"Category {category_id} is not active (status: {category.status.value})")
+        if unit_code is not None and unit_found is None:
+            raise ValidationException(f"Unit of measure '{unit_code}' does not exist")
         return category
 
     async def _validate_unit(self, unit_code: str) -> None:
@@ -595,6 +681,21 @@ class ProductService:
         if unit is None:
             raise ValidationException(f"Unit of measure '{unit_code}' does not exist")
 
+    async def _raise_update_conflict(
+        self, product_id: uuid.UUID, expected_version: int, new_code: str | None
+    ) -> NoReturn:
+        """Explain why a guarded product UPDATE matched no row."""
+        if new_code is not None:
+            taken = await self._session.scalar(
+                select(exists().where(Product.impa_code == new_code, Product.id != product_id))
+            )
+            if taken:
+                raise ConflictException(f"Product with IMPA code '{new_code}' already exists")
+        actual = await self._session.scalar(select(Product.version).where(Product.id == product_id))
+        if actual is None:
+            raise NotFoundException(f"Product {product_id} not found")
+        raise ConflictException(f"Version conflict: expected {expected_version}, actual {actual}")
+
     async def _audit_log(
         self,
         entity_type: str,
@@ -4,16 +4,25 @@ from __future__ import annotations
 
 import uuid
 
+from cachetools import LRUCache
 from jsonschema import Draft7Validator, ValidationError as JsonSchemaValidationError
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.exceptions import ValidationException
-from src.modules.product.constants import IMPA_CODE_REGEX
+from src.models.category_schema import CategorySchema
+from src.modules.product.constants import IMPA_CODE_MAX_LENGTH, IMPA_CODE_REGEX
+
+# A CategorySchema row's schema_json never changes once registered, so
+# validators keyed by schema id need no invalidation on activation
+_compiled_validators: LRUCache[uuid.UUID, Draft7Validator] = LRUCache(maxsize=512)
 
 
 def validate_impa_code_format(code: str) -> bool:
     """Check whether *code* matches the IMPA format (6-digit or EXT-XXXXXX)."""
-    return bool(IMPA_CODE_REGEX.match(code))
+    # Only 6- and 10-character strings can match, so most bad input skips the
+    # regex; fullmatch because "$" would also accept a trailing newline
+    return len(code) in (6, IMPA_CODE_MAX_LENGTH) and IMPA_CODE_REGEX.fullmatch(code) is not None
 
 
 def validate_specifications(specs: dict, attribute_schema: dict | None) -> None:
@@ -62,12 +71,44 @@ async def validate_specifications_with_schema(
     from src.modules.product.category_service import CategoryService
 
     svc = CategoryService(session)
-    effective_schema = await svc.get_effective_schema(category_id)
+    schema_id = await svc.get_effective_schema_id(category_id)
+    return await _validate_against_schema(specs, schema_id, session)
+
+
+async def validate_product_specifications(
+    product_id: uuid.UUID,
+    session: AsyncSession,
+) -> dict:
+    """Validate a stored product's specifications against its effective schema.
+
+    Same result as :func:`validate_specifications_with_schema`, but the product
+    and its effective schema id are resolved in a single query.
+    Raises NotFoundException if the product does not exist.
+    """
+    from src.modules.product.service import ProductService
 
-    if effective_schema is None:
+    svc = ProductService(session)
+    specs, schema_id = await svc.get_specs_with_effective_schema_id(product_id)
+    return await _validate_against_schema(specs, schema_id, session)
+
+
+async def _validate_against_schema(
+    specs: dict,
+    schema_id: uuid.UUID | None,
+    session: AsyncSession,
+) -> dict:
+    if schema_id is None:
         return {"valid": True, "errors": [], "schema_source": None}
 
-    validator = Draft7Validator(effective_schema)
+    validator = _compiled_validators.get(schema_id)
+    if validator is None:
+        # Only a cache miss pays for fetching the schema body
+        schema_json = await session.scalar(
+            select(CategorySchema.schema_json).where(CategorySchema.id == schema_id)
+        )
+        validator = Draft7Validator(schema_json)
+        _compiled_validators[schema_id] = validator
+
     errors = sorted(validator.iter_errors(specs), key=lambda e: list(e.absolute_path))
 
     if not errors:
@@ -0,0 +1,44 @@
+"""Build response models from trusted ORM objects without re-validation."""
+
+from __future__ import annotations
+
+import functools
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+
+_MISSING = object()
+
+
+@functools.cache
+def fields_of(cls: type[BaseModel]) -> tuple[tuple[str, str], ...]:
+    """Return ``(field_name, attribute_name)`` pairs for *cls*, computed once."""
+    pairs = []
+    for name, field in cls.model_fields.items():
+        attr = field.validation_alias if isinstance(field.validation_alias, str) else field.alias
+        pairs.append((name, attr or name))
+    return tuple(pairs)
+
+
+def construct_from_orm[ModelT: BaseModel](cls: type[ModelT], obj: Any, **overrides: Any) -> ModelT:
+    """Build *cls* from *obj*'s attributes via ``model_construct``.
+
+    Only for rows loaded from the database, whose column types already match
+    the response fields. Attributes are read by validation alias (as
+    ``from_attributes`` would) and fields the object lacks keep their defaults,
+    as do deferred ORM columns, which are never lazy-loaded. Nested models are
+    not converted, so *cls* must be flat. Keyword *overrides* take precedence
+    over attributes, for fields not read straight off *obj*.
+    """
+    state = inspect(obj, raiseerr=False)
+    unloaded = state.unloaded if state is not None else ()
+    values: dict[str, Any] = {}
+    for name, attr in fields_of(cls):
+        if name in overrides or attr in unloaded:
+            continue
+        value = getattr(obj, attr, _MISSING)
+        if value is not _MISSING:
+            values[name] = value
+    values.update(overrides)
+    return cls.model_construct(**values)
@@ -11,7 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from src.app import app
 from src.config import settings
 from src.database.base import Base
-from src.database.session import get_db
+from src.database.session import get_db, get_readonly_db
 
 
 @pytest.fixture(scope="session")
@@ -49,6 +49,7 @@ async def async_client(async_session: AsyncSession) -> AsyncGenerator[AsyncClien
         yield async_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_readonly_db] = override_get_db
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
@@ -8,9 +8,11 @@ Covers:
 
 from __future__ import annotations
 
+import json
 import uuid
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
 import pytest_asyncio
@@ -22,7 +24,9 @@ from src.modules.product.schema_governance import (
     MAX_NESTING_DEPTH,
     MAX_SCHEMA_SIZE_BYTES,
     SchemaGovernanceService,
+    serialize_schema,
 )
+from src.modules.product.schema_registry import schema_content_hash
 
 
 # =========================================================================
@@ -108,6 +112,24 @@ class TestSchemaGovernanceValidation:
         with pytest.raises(ValidationException, match="maximum size"):
             self.governance.validate_schema(schema)
 
+    def test_schema_at_size_limit_is_accepted(self) -> None:
+        overhead = len(json.dumps({"type": "object", "description": ""}))
+        schema = {"type": "object", "description": "A" * (MAX_SCHEMA_SIZE_BYTES - overhead)}
+        assert len(json.dumps(schema)) == MAX_SCHEMA_SIZE_BYTES
+        self.governance.validate_schema(schema)
+
+    def test_uses_presupplied_serialization(self) -> None:
+        schema = {"type": "object"}
+        oversized = "x" * (MAX_SCHEMA_SIZE_BYTES + 1)
+        with pytest.raises(ValidationException, match="maximum size"):
+            self.governance.validate_schema(schema, oversized)
+
+    def test_serialization_ignores_key_order(self) -> None:
+        a = {"type": "object", "properties": {"b": {}, "a": {}}}
+        b = {"properties": {"a": {}, "b": {}}, "type": "object"}
+        assert serialize_schema(a) == serialize_schema(b)
+        assert len(serialize_schema(a)) == len(json.dumps(a))
+
     def test_reject_non_dict_schema(self) -> None:
         with pytest.raises(ValidationException, match="must be a JSON object"):
             self.governance.validate_schema("not a dict")  # type: ignore[arg-type]
@@ -149,6 +171,24 @@ class TestSchemaGovernanceValidation:
             self.governance.validate_schema(schema)
 
 
+class TestCategorySchemaCreate:
+    def test_reads_schema_json_from_wire(self) -> None:
+        from src.modules.product.schemas import CategorySchemaCreate
+
+        data = CategorySchemaCreate.model_validate({"schema_json": {"type": "object"}})
+
+        # The attribute is schema_definition; data.schema_json is BaseModel's method
+        assert data.schema_definition == {"type": "object"}
+
+    def test_python_field_name_is_not_accepted_on_the_wire(self) -> None:
+        from pydantic import ValidationError
+
+        from src.modules.product.schemas import CategorySchemaCreate
+
+        with pytest.raises(ValidationError):
+            CategorySchemaCreate.model_validate({"schema_definition": {"type": "object"}})
+
+
 class TestSchemaGovernanceBreakingChanges:
     """Tests for SchemaGovernanceService.detect_breaking_changes."""
 
@@ -234,6 +274,38 @@ class TestSchemaGovernanceBreakingChanges:
         assert len(changes) == 1
         assert changes[0]["field"] == "dimensions.width"
 
+    def test_deeply_nested_change_reports_full_path(self) -> None:
+        old_schema = {
+            "type": "object",
+            "properties": {
+                "rigging": {
+                    "type": "object",
+                    "properties": {
+                        "shackle": {
+                            "type": "object",
+                            "properties": {"pin": {"type": "string"}},
+                            "required": ["pin"],
+                        },
+                        "swl": {"type": "number"},
+                    },
+                },
+            },
+        }
+        new_schema = {
+            "type": "object",
+            "properties": {
+                "rigging": {
+                    "type": "object",
+                    "properties": {
+                        "shackle": {"type": "object", "properties": {}},
+                        "swl": {"type": "string"},
+                    },
+                },
+            },
+        }
+        changes = self.governance.detect_breaking_changes(old_schema, new_schema)
+        assert [c["field"] for c in changes] == ["rigging.shackle.pin", "rigging.swl"]
+
     def test_no_old_schema_returns_empty(self) -> None:
         new_schema = {"type": "object", "properties": {"x": {"type": "string"}}}
         changes = self.governance.detect_breaking_changes(None, new_schema)
@@ -294,15 +366,13 @@ class TestSchemaRegistryService:
         category_id = uuid.uuid4()
         session = AsyncMock()
 
-        # Mock: no active schema
-        active_result = MagicMock()
-        active_result.scalar_one_or_none.return_value = None
-
-        # Mock: max version = 0
-        max_version_result = MagicMock()
-        max_version_result.scalar.return_value = 0
-
-        session.execute = AsyncMock(side_effect=[active_result, max_version_result])
+        # Mock: category exists, max version = 0, no active schema
+        lookup_result = MagicMock()
+        lookup_result.one_or_none.return_value = (0, None)
+        inserted = self._make_schema(category_id, version=1)
+        insert_result = MagicMock()
+        insert_result.scalar_one.return_value = inserted
+        session.execute = AsyncMock(side_effect=[lookup_result, insert_result])
 
         registry = SchemaRegistryService(session)
         schema_json = {
@@ -312,11 +382,33 @@ class TestSchemaRegistryService:
 
         schema = await registry.register_schema(category_id, schema_json, uuid.uuid4())
 
-        assert schema.version == 1
-        assert schema.status == SchemaStatus.DRAFT
-        assert schema.schema_json == schema_json
-        session.add.assert_called_once()
-        session.flush.assert_awaited_once()
+        assert schema is inserted
+        # Lookup, then a single INSERT ... RETURNING; no unit-of-work flush
+        assert session.execute.await_count == 2
+        session.add.assert_not_called()
+        session.flush.assert_not_awaited()
+        insert_stmt = session.execute.call_args_list[1].args[0]
+        assert "RETURNING" in str(insert_stmt)
+        params = insert_stmt.compile().params
+        assert params["version"] == 1
+        assert params["status"] == SchemaStatus.DRAFT
+        assert params["schema_json"] == schema_json
+        assert params["content_hash"] == schema_content_hash(serialize_schema(schema_json))
+
+    @pytest.mark.asyncio
+    async def test_register_schema_for_missing_category_raises(self) -> None:
+        from src.modules.product.schema_registry import SchemaRegistryService
+
+        session = AsyncMock()
+        lookup_result = MagicMock()
+        lookup_result.one_or_none.return_value = None
+        session.execute = AsyncMock(return_value=lookup_result)
+
+        registry = SchemaRegistryService(session)
+
+        with pytest.raises(NotFoundException):
+            await registry.register_schema(uuid.uuid4(), {"type": "object"})
+        session.execute.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_register_schema_rejects_breaking_changes(self) -> None:
@@ -336,9 +428,9 @@ class TestSchemaRegistryService:
                 "required": ["material"],
             },
         )
-        active_result = MagicMock()
-        active_result.scalar_one_or_none.return_value = active_schema
-        session.execute = AsyncMock(return_value=active_result)
+        lookup_result = MagicMock()
+        lookup_result.one_or_none.return_value = (1, active_schema)
+        session.execute = AsyncMock(return_value=lookup_result)
 
         registry = SchemaRegistryService(session)
 
@@ -351,6 +443,51 @@ class TestSchemaRegistryService:
         with pytest.raises(BusinessRuleException, match="breaking changes"):
             await registry.register_schema(category_id, new_schema_json)
 
+    @pytest.mark.asyncio
+    async def test_register_unchanged_schema_returns_active(self) -> None:
+        from src.modules.product.schema_registry import SchemaRegistryService
+
+        category_id = uuid.uuid4()
+        session = AsyncMock()
+        schema_json = {"type": "object", "properties": {"material": {"type": "string"}}}
+        active_schema = self._make_schema(
+            category_id, version=3, status=SchemaStatus.ACTIVE, schema_json=schema_json
+        )
+        active_schema.content_hash = schema_content_hash(serialize_schema(schema_json))
+        lookup_result = MagicMock()
+        lookup_result.one_or_none.return_value = (3, active_schema)
+        session.execute = AsyncMock(return_value=lookup_result)
+
+        registry = SchemaRegistryService(session)
+        # Same content, different key order
+        resubmitted = {"properties": {"material": {"type": "string"}}, "type": "object"}
+
+        with patch("src.modules.product.schema_registry._governance") as governance:
+            result = await registry.register_schema(category_id, resubmitted)
+
+        assert result is active_schema
+        governance.validate_schema.assert_not_called()
+        # Only the lookup ran; nothing was inserted
+        session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_register_unchanged_legacy_schema_compares_json(self) -> None:
+        from src.modules.product.schema_registry import SchemaRegistryService
+
+        category_id = uuid.uuid4()
+        session = AsyncMock()
+        active_schema = self._make_schema(category_id, version=1, status=SchemaStatus.ACTIVE)
+        active_schema.content_hash = None
+        lookup_result = MagicMock()
+        lookup_result.one_or_none.return_value = (1, active_schema)
+        session.execute = AsyncMock(return_value=lookup_result)
+
+        registry = SchemaRegistryService(session)
+        result = await registry.register_schema(category_id, dict(active_schema.schema_json))
+
+        assert result is active_schema
+        session.execute.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_activate_schema(self) -> None:
         from src.modules.product.schema_registry import SchemaRegistryService
@@ -359,17 +496,24 @@ class TestSchemaRegistryService:
         schema_id = uuid.uuid4()
         session = AsyncMock()
 
-        draft_schema = self._make_schema(category_id, version=2, status=SchemaStatus.DRAFT)
-        draft_schema.id = schema_id
-        session.get = AsyncMock(return_value=draft_schema)
-        session.execute = AsyncMock()
+        activated = self._make_schema(category_id, version=2, status=SchemaStatus.ACTIVE)
+        activated.id = schema_id
+        activated.activated_at = datetime.now(timezone.utc)
+        activate_result = MagicMock()
+        activate_result.scalar_one_or_none.return_value = activated
+        session.execute = AsyncMock(side_effect=[MagicMock(), activate_result])
 
         registry = SchemaRegistryService(session)
         result = await registry.activate_schema(schema_id)
 
+        assert result is activated
         assert result.status == SchemaStatus.ACTIVE
-        assert result.activated_at is not None
-        session.flush.assert_awaited_once()
+        # Deprecate then activate; no preflight load or flush
+        assert session.execute.await_count == 2
+        session.get.assert_not_awaited()
+        deprecate_sql = str(session.execute.call_args_list[0].args[0])
+        assert "UPDATE category_schemas" in deprecate_sql
+        assert "target.status" in deprecate_sql
 
     @pytest.mark.asyncio
     async def test_activate_non_draft_raises(self) -> None:
@@ -381,6 +525,9 @@ class TestSchemaRegistryService:
         active_schema = self._make_schema(uuid.uuid4(), version=1, status=SchemaStatus.ACTIVE)
         active_schema.id = schema_id
         session.get = AsyncMock(return_value=active_schema)
+        no_row = MagicMock()
+        no_row.scalar_one_or_none.return_value = None
+        session.execute = AsyncMock(return_value=no_row)
 
         registry = SchemaRegistryService(session)
 
@@ -393,6 +540,9 @@ class TestSchemaRegistryService:
 
         session = AsyncMock()
         session.get = AsyncMock(return_value=None)
+        no_row = MagicMock()
+        no_row.scalar_one_or_none.return_value = None
+        session.execute = AsyncMock(return_value=no_row)
 
         registry = SchemaRegistryService(session)
 
@@ -422,6 +572,21 @@ class TestSchemaRegistryService:
         assert len(history) == 2
         assert history[0].version == 2
         assert history[1].version == 1
+        stmt_sql = str(session.execute.call_args.args[0])
+        assert "category_schemas.version" in stmt_sql
+        assert "category_schemas.schema_json" not in stmt_sql
+
+    @pytest.mark.asyncio
+    async def test_list_schema_history_with_body(self) -> None:
+        from src.modules.product.schema_registry import SchemaRegistryService
+
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+
+        registry = SchemaRegistryService(session)
+        await registry.list_schema_history(uuid.uuid4(), include_body=True)
+
+        assert "category_schemas.schema_json" in str(session.execute.call_args.args[0])
 
 
 # =========================================================================
@@ -441,7 +606,7 @@ class TestSchemaAwareValidation:
             "src.modules.product.category_service.CategoryService"
         ) as mock_cat_svc_cls:
             mock_instance = MagicMock()
-            mock_instance.get_effective_schema = AsyncMock(return_value=None)
+            mock_instance.get_effective_schema_id = AsyncMock(return_value=None)
             mock_cat_svc_cls.return_value = mock_instance
 
             result = await validate_specifications_with_schema(
@@ -468,11 +633,12 @@ class TestSchemaAwareValidation:
         }
 
         session = AsyncMock()
+        session.scalar = AsyncMock(return_value=effective_schema)
         with patch(
             "src.modules.product.category_service.CategoryService"
         ) as mock_cat_svc_cls:
             mock_instance = MagicMock()
-            mock_instance.get_effective_schema = AsyncMock(return_value=effective_schema)
+            mock_instance.get_effective_schema_id = AsyncMock(return_value=uuid.uuid4())
             mock_cat_svc_cls.return_value = mock_instance
 
             result = await validate_specifications_with_schema(
@@ -498,11 +664,12 @@ class TestSchemaAwareValidation:
         }
 
         session = AsyncMock()
+        session.scalar = AsyncMock(return_value=effective_schema)
         with patch(
             "src.modules.product.category_service.CategoryService"
         ) as mock_cat_svc_cls:
             mock_instance = MagicMock()
-            mock_instance.get_effective_schema = AsyncMock(return_value=effective_schema)
+            mock_instance.get_effective_schema_id = AsyncMock(return_value=uuid.uuid4())
             mock_cat_svc_cls.return_value = mock_instance
 
             result = await validate_specifications_with_schema(
@@ -515,6 +682,65 @@ class TestSchemaAwareValidation:
         assert len(result["errors"]) > 0
         assert result["schema_source"] == "inherited"
 
+    @pytest.mark.asyncio
+    async def test_compiled_validator_is_reused_per_schema_version(self) -> None:
+        from src.modules.product.validators import validate_specifications_with_schema
+
+        schema_id = uuid.uuid4()
+        session = AsyncMock()
+        session.scalar = AsyncMock(
+            return_value={"type": "object", "required": ["material"]}
+        )
+        with patch(
+            "src.modules.product.category_service.CategoryService"
+        ) as mock_cat_svc_cls:
+            mock_instance = MagicMock()
+            mock_instance.get_effective_schema_id = AsyncMock(return_value=schema_id)
+            mock_cat_svc_cls.return_value = mock_instance
+
+            first = await validate_specifications_with_schema(
+                specs={}, category_id=uuid.uuid4(), session=session
+            )
+            second = await validate_specifications_with_schema(
+                specs={"material": "steel"}, category_id=uuid.uuid4(), session=session
+            )
+
+        assert first["valid"] is False
+        assert second["valid"] is True
+        # Schema body fetched once; the second call reused the compiled validator
+        session.scalar.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_product_validation_resolves_specs_and_schema_in_one_query(self) -> None:
+        from src.modules.product.validators import validate_product_specifications
+
+        session = AsyncMock()
+        lookup = MagicMock()
+        lookup.one_or_none.return_value = ({"color": "red"}, uuid.uuid4())
+        session.execute = AsyncMock(return_value=lookup)
+        session.scalar = AsyncMock(return_value={"type": "object", "required": ["material"]})
+
+        result = await validate_product_specifications(uuid.uuid4(), session)
+
+        assert result["valid"] is False
+        assert result["errors"][0]["field"] == "(root)"
+        session.execute.assert_awaited_once()
+        stmt_sql = str(session.execute.call_args.args[0])
+        assert "products.specifications" in stmt_sql
+        assert "category_closures" in stmt_sql
+
+    @pytest.mark.asyncio
+    async def test_product_validation_missing_product_raises(self) -> None:
+        from src.modules.product.validators import validate_product_specifications
+
+        session = AsyncMock()
+        lookup = MagicMock()
+        lookup.one_or_none.return_value = None
+        session.execute = AsyncMock(return_value=lookup)
+
+        with pytest.raises(NotFoundException):
+            await validate_product_specifications(uuid.uuid4(), session)
+
 
 # =========================================================================
 # Effective Schema Inheritance (mocked DB)
@@ -538,29 +764,41 @@ class TestEffectiveSchemaInheritance:
         mock_category = MagicMock()
         session.get = AsyncMock(return_value=mock_category)
 
-        # Ancestor query: self only
-        ancestor_result = MagicMock()
-        ancestor_result.all.return_value = [(category_id,)]
-
-        # Schema query: found
-        active_schema = MagicMock()
-        active_schema.schema_json = expected_schema
+        # Nearest-schema query: own schema found
         schema_result = MagicMock()
-        schema_result.scalar_one_or_none.return_value = active_schema
+        schema_result.scalar_one_or_none.return_value = expected_schema
 
-        session.execute = AsyncMock(side_effect=[ancestor_result, schema_result])
+        session.execute = AsyncMock(return_value=schema_result)
 
         svc = CategoryService(session)
         result = await svc.get_effective_schema(category_id)
 
         assert result == expected_schema
 
+    @pytest.mark.asyncio
+    async def test_effective_schema_id_skips_schema_body(self) -> None:
+        from src.modules.product.category_service import CategoryService
+
+        schema_id = uuid.uuid4()
+        session = AsyncMock()
+        schema_result = MagicMock()
+        schema_result.scalar_one_or_none.return_value = schema_id
+        session.execute = AsyncMock(return_value=schema_result)
+
+        svc = CategoryService(session)
+        result = await svc.get_effective_schema_id(uuid.uuid4())
+
+        assert result == schema_id
+        stmt_sql = str(session.execute.call_args.args[0])
+        assert "SELECT category_schemas.id" in stmt_sql
+        assert "schema_json" not in stmt_sql
+        session.get.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_inherits_from_parent_when_self_has_no_schema(self) -> None:
         from src.modules.product.category_service import CategoryService
 
         child_id = uuid.uuid4()
-        parent_id = uuid.uuid4()
         parent_schema = {"type": "object", "properties": {"inherited": {"type": "boolean"}}}
 
         session = AsyncMock()
@@ -569,28 +807,22 @@ class TestEffectiveSchemaInheritance:
         mock_category = MagicMock()
         session.get = AsyncMock(return_value=mock_category)
 
-        # Ancestors: self, then parent
-        ancestor_result = MagicMock()
-        ancestor_result.all.return_value = [(child_id,), (parent_id,)]
-
-        # Schema for child: none
-        child_schema_result = MagicMock()
-        child_schema_result.scalar_one_or_none.return_value = None
-
-        # Schema for parent: found
-        parent_schema_obj = MagicMock()
-        parent_schema_obj.schema_json = parent_schema
-        parent_schema_result = MagicMock()
-        parent_schema_result.scalar_one_or_none.return_value = parent_schema_obj
+        # Nearest-schema query: the child has none, so the parent's is the
+        # closest ACTIVE schema by closure depth
+        schema_result = MagicMock()
+        schema_result.scalar_one_or_none.return_value = parent_schema
 
-        session.execute = AsyncMock(
-            side_effect=[ancestor_result, child_schema_result, parent_schema_result]
-        )
+        session.execute = AsyncMock(return_value=schema_result)
 
         svc = CategoryService(session)
         result = await svc.get_effective_schema(child_id)
 
         assert result == parent_schema
+        # Resolved in one round trip: nearest ancestor first, first hit only
+        session.execute.assert_awaited_once()
+        sql = str(session.execute.call_args.args[0])
+        assert "ORDER BY category_closures.depth ASC" in sql
+        assert "LIMIT" in sql
 
     @pytest.mark.asyncio
     async def test_returns_none_when_no_ancestor_has_schema(self) -> None:
@@ -602,13 +834,10 @@ class TestEffectiveSchemaInheritance:
         mock_category = MagicMock()
         session.get = AsyncMock(return_value=mock_category)
 
-        ancestor_result = MagicMock()
-        ancestor_result.all.return_value = [(category_id,)]
-
         schema_result = MagicMock()
         schema_result.scalar_one_or_none.return_value = None
 
-        session.execute = AsyncMock(side_effect=[ancestor_result, schema_result])
+        session.execute = AsyncMock(return_value=schema_result)
 
         svc = CategoryService(session)
         result = await svc.get_effective_schema(category_id)
@@ -622,11 +851,326 @@ class TestEffectiveSchemaInheritance:
         session = AsyncMock()
         session.get = AsyncMock(return_value=None)
 
+        schema_result = MagicMock()
+        schema_result.scalar_one_or_none.return_value = None
+        session.execute = AsyncMock(return_value=schema_result)
+
         svc = CategoryService(session)
 
         with pytest.raises(NotFoundException):
             await svc.get_effective_schema(uuid.uuid4())
 
+    @pytest.mark.asyncio
+    async def test_skips_existence_check_when_schema_found(self) -> None:
+        from src.modules.product.category_service import CategoryService
+
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=None)
+
+        schema_result = MagicMock()
+        schema_result.scalar_one_or_none.return_value = {"type": "object"}
+        session.execute = AsyncMock(return_value=schema_result)
+
+        svc = CategoryService(session)
+        result = await svc.get_effective_schema(uuid.uuid4())
+
+        assert result == {"type": "object"}
+        session.get.assert_not_awaited()
+
+
+# =========================================================================
+# Category Lookup Cache (mocked DB)
+# =========================================================================
+
+
+class TestCategoryLookupCache:
+    """Tests for the per-request category cache in CategoryService."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_lookup_skips_session_get(self) -> None:
+        from src.modules.product.category_service import CategoryService
+
+        category_id = uuid.uuid4()
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=MagicMock())
+
+        svc = CategoryService(session)
+        first = await svc.get_category(category_id)
+        second = await svc.get_category(category_id)
+
+        assert first is second
+        session.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_category_is_not_cached(self) -> None:
+        from src.modules.product.category_service import CategoryService
+
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=None)
+
+        svc = CategoryService(session)
+        category_id = uuid.uuid4()
+        for _ in range(2):
+            with pytest.raises(NotFoundException):
+                await svc.get_category(category_id)
+
+        assert session.get.await_count == 2
+
+
+    @pytest.mark.asyncio
+    async def test_move_under_descendant_loads_both_categories_at_once(self) -> None:
+        from src.modules.product.category_service import CategoryService
+
+        category_id = uuid.uuid4()
+        child_id = uuid.uuid4()
+        category = MagicMock(id=category_id)
+        child = MagicMock(id=child_id)
+
+        categories_result = MagicMock()
+        categories_result.scalars.return_value = [child, category]
+        descendants_result = MagicMock()
+        descendants_result.all.return_value = [(category_id,), (child_id,)]
+
+        session = AsyncMock()
+        session.execute = AsyncMock(side_effect=[categories_result, descendants_result])
+
+        svc = CategoryService(session)
+        with pytest.raises(ValidationException):
+            await svc.move_subtree(category_id, child_id)
+
+        assert session.execute.await_count == 2
+        session.get.assert_not_awaited()
+
+
+class TestPrefixResolutionCache:
+    """Tests for the process-wide IMPA/ISSA prefix resolution cache."""
+
+    def setup_method(self) -> None:
+        from src.modules.product import category_service
+
+        category_service._impa_prefix_cache.clear()
+        category_service._issa_prefix_cache.clear()
+        category_service._category_prefix_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_repeat_prefix_resolves_from_cache(self) -> None:
+        from src.modules.product.category_service import CategoryService
+
+        category = MagicMock()
+        category.id = uuid.uuid4()
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = category
+
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=result)
+        session.get = AsyncMock(return_value=category)
+
+        first = await CategoryService(session).resolve_category_by_impa_prefix("45")
+        second = await CategoryService(session).resolve_category_by_impa_prefix("45")
+
+        assert first is category
+        assert second is category
+        session.execute.assert_awaited_once()
+        session.get.assert_awaited_once_with(ANY, category.id)
+
+    @pytest.mark.asyncio
+    async def test_unmapped_prefix_is_cached(self) -> None:
+        from src.modules.product.category_service import CategoryService
+
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = None
+
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=result)
+
+        svc = CategoryService(session)
+        assert await svc.resolve_category_by_issa_prefix("99") is None
+        assert await svc.resolve_category_by_issa_prefix("99") is None
+        session.execute.assert_awaited_once()
+        session.get.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_upsert_invalidates_prefix(self) -> None:
+        from src.modules.product import category_service
+        from src.modules.product.schemas import ImpaMappingCreate
+
+        category_service._impa_prefix_cache["45"] = None
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+
+        data = ImpaMappingCreate(
+            impa_prefix="45",
+            impa_category_name="Deck stores",
+            internal_category_id=uuid.uuid4(),
+        )
+        await category_service.CategoryService(session).upsert_impa_mapping(data)
+
+        assert "45" not in category_service._impa_prefix_cache
+
+    @pytest.mark.asyncio
+    async def test_prefix_suggestion_resolves_from_cache(self) -> None:
+        from src.modules.product.category_service import CategoryService
+
+        category_id = uuid.uuid4()
+        result = MagicMock()
+        row = MagicMock(id=category_id)
+        row.name = "Provisions"
+        result.one_or_none.return_value = row
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=result)
+
+        svc = CategoryService(session)
+        assert await svc.suggest_category_for_impa_prefix("45") == (category_id, "Provisions")
+        assert await svc.suggest_category_for_impa_prefix("45") == (category_id, "Provisions")
+        session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_category_update_drops_prefix_suggestion(self) -> None:
+        from src.modules.product import category_service
+        from src.modules.product.schemas import CategoryUpdate
+
+        category = MagicMock(impa_prefix="45")
+        category_service._category_prefix_cache["45"] = (uuid.uuid4(), "Old name")
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=category)
+
+        await category_service.CategoryService(session).update_category(
+            uuid.uuid4(), CategoryUpdate(name="Provisions")
+        )
+
+        assert "45" not in category_service._category_prefix_cache
+
+    @pytest.mark.asyncio
+    async def test_category_prefix_change_drops_old_and_new_suggestions(self) -> None:
+        from src.modules.product import category_service
+
+        category = SimpleNamespace(impa_prefix="45")
+        category_service._category_prefix_cache["45"] = (uuid.uuid4(), "Provisions")
+        category_service._category_prefix_cache["46"] = None
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=category)
+        data = MagicMock()
+        data.model_dump.return_value = {"impa_prefix": "46"}
+
+        await category_service.CategoryService(session).update_category(uuid.uuid4(), data)
+
+        assert "45" not in category_service._category_prefix_cache
+        assert "46" not in category_service._category_prefix_cache
+
+
+class TestTreeByPath:
+    """Tests for CategoryService.get_tree_by_path (ltree walk, no closure)."""
+
+    @pytest.mark.asyncio
+    async def test_scopes_subtree_by_ltree_path(self) -> None:
+        from sqlalchemy.dialects import postgresql
+
+        from src.modules.product.category_service import CategoryService
+
+        root = MagicMock()
+        root.path = "DECK.ROPES"
+        root.level = 1
+
+        child = MagicMock()
+        child.id = uuid.uuid4()
+        child.code = "MOOR"
+        child.name = "Mooring Lines"
+        child.path = "DECK.ROPES.MOOR"
+        child.level = 2
+        child.icon = None
+        child.display_order = 0
+        child.status = "ACTIVE"
+
+        result = MagicMock()
+        result.mappings.return_value = [
+            {"Category": child, "children_count": 0, "product_count": 7},
+        ]
+
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=root)
+        session.execute = AsyncMock(return_value=result)
+
+        svc = CategoryService(session)
+        nodes = await svc.get_tree_by_path(uuid.uuid4(), max_depth=1)
+
+        assert [(n.code, n.product_count) for n in nodes] == [("MOOR", 7)]
+        sql = str(
+            session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+        )
+        assert "CAST(categories.path AS LTREE) <@" in sql
+        assert "category_closures" not in sql
+
+
+# =========================================================================
+# Subtree Product Count (mocked DB)
+# =========================================================================
+
+
+class TestSubtreeProductCount:
+    """Tests for CategoryService.count_products_in_subtree budgeted counting."""
+
+    @staticmethod
+    def _plan_result(plan_rows: int) -> MagicMock:
+        result = MagicMock()
+        result.scalar_one.return_value = [{"Plan": {"Plan Rows": plan_rows}}]
+        return result
+
+    @staticmethod
+    def _count_result(count: int, category_exists: bool = True) -> MagicMock:
+        result = MagicMock()
+        result.one.return_value = SimpleNamespace(count=count, category_exists=category_exists)
+        return result
+
+    @pytest.mark.asyncio
+    async def test_returns_estimate_above_budget(self) -> None:
+        from src.modules.product.category_service import CategoryService
+
+        session = AsyncMock()
+        session.execute = AsyncMock(
+            side_effect=[self._count_result(5001), self._plan_result(120_000)]
+        )
+
+        svc = CategoryService(session)
+        result = await svc.count_products_in_subtree(uuid.uuid4(), budget=5000)
+
+        assert result == (120_000, True)
+        assert session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_runs_exact_count_within_budget(self) -> None:
+        from sqlalchemy.dialects import postgresql
+
+        from src.modules.product.category_service import CategoryService
+
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=self._count_result(42))
+
+        svc = CategoryService(session)
+        result = await svc.count_products_in_subtree(uuid.uuid4(), budget=5000)
+
+        assert result == (42, False)
+        session.execute.assert_awaited_once()
+        sql = str(
+            session.execute.call_args.args[0].compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+        assert "LIMIT 5001" in sql
+        assert "EXPLAIN" not in sql
+
+    @pytest.mark.asyncio
+    async def test_missing_category_raises_not_found(self) -> None:
+        from src.modules.product.category_service import CategoryService
+
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=self._count_result(0, category_exists=False))
+
+        svc = CategoryService(session)
+
+        with pytest.raises(NotFoundException):
+            await svc.count_products_in_subtree(uuid.uuid4())
+        session.execute.assert_awaited_once()
+
 
 # =========================================================================
 # Nesting Depth Helper (edge cases)
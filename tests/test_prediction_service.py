@@ -8,6 +8,7 @@ from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.orm import Session
 
 from src.exceptions import NotFoundException
 from src.models.enums import RfqStatus, VesselStatus, VesselType
@@ -18,8 +19,13 @@ from src.models.vessel import Vessel
 from src.modules.prediction.co_occurrence import CoOccurrenceService
 from src.modules.prediction.constants import CONSUMPTION_RATES
 from src.modules.prediction.consumption_engine import ConsumptionEngine
-from src.modules.prediction.reorder_service import ReorderService
-from src.modules.prediction.schemas import PredictedItem
+from src.modules.prediction.reorder_service import (
+    ReorderService,
+    _evict_last_order_cache,
+    _last_order_cache,
+    _queue_last_order_eviction,
+)
+from src.modules.prediction.schemas import CoOccurrenceRequest, PredictedItem, PredictionRequest
 from src.modules.prediction.template_service import TemplateService
 
 # ---------------------------------------------------------------------------
@@ -160,6 +166,20 @@ def _make_unique_scalar_result(value):
     return result
 
 
+def _make_one_or_none_result(row):
+    """Build a MagicMock with .one_or_none() returning ``row``."""
+    result = MagicMock()
+    result.one_or_none.return_value = row
+    return result
+
+
+def _make_unique_scalars_result(values):
+    """Build a MagicMock with .unique().scalars().all() returning ``values``."""
+    result = MagicMock()
+    result.unique.return_value = _make_scalars_all_result(values)
+    return result
+
+
 def _make_all_result(rows):
     """Build a MagicMock with .all() returning ``rows``."""
     result = MagicMock()
@@ -406,15 +426,20 @@ class TestTemplateService:
 
 
 class TestReorderService:
+    def setup_method(self) -> None:
+        _last_order_cache.clear()
+
     @pytest.mark.asyncio
     async def test_get_last_order_found(
         self, mock_session, sample_rfq, sample_line_items
     ):
         """Should return the most recent completed RFQ as a ReorderSuggestion."""
         svc = ReorderService(mock_session)
-        sample_rfq.line_items = sample_line_items
 
-        mock_session.execute.return_value = _make_unique_scalar_result(sample_rfq)
+        mock_session.execute.side_effect = [
+            _make_one_or_none_result(sample_rfq),               # RFQ header
+            _make_all_result(sample_line_items),                # line item rows
+        ]
 
         suggestion = await svc.get_last_order(
             vessel_id=sample_rfq.vessel_id, port="INMAA"
@@ -433,10 +458,104 @@ class TestReorderService:
         """Should return None when no completed RFQ exists for the vessel."""
         svc = ReorderService(mock_session)
 
-        mock_session.execute.return_value = _make_unique_scalar_result(None)
+        mock_session.execute.return_value = _make_one_or_none_result(None)
 
         suggestion = await svc.get_last_order(vessel_id=uuid.uuid4())
         assert suggestion is None
+        # Line items are never queried when there is no matching RFQ
+        assert mock_session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_last_order_cached_per_tenant(
+        self, mock_session, sample_rfq, sample_line_items
+    ):
+        """Repeated lookups for the same tenant/vessel/port should hit the cache."""
+        svc = ReorderService(mock_session)
+        org_id = uuid.uuid4()
+
+        mock_session.execute.side_effect = [
+            _make_one_or_none_result(sample_rfq),
+            _make_all_result(sample_line_items),
+            _make_one_or_none_result(sample_rfq),
+            _make_all_result(sample_line_items),
+        ]
+
+        first = await svc.get_last_order(
+            vessel_id=sample_rfq.vessel_id, port="INMAA", organization_id=org_id
+        )
+        second = await svc.get_last_order(
+            vessel_id=sample_rfq.vessel_id, port="INMAA", organization_id=org_id
+        )
+        await svc.get_last_order(
+            vessel_id=sample_rfq.vessel_id, port="INMAA", organization_id=uuid.uuid4()
+        )
+
+        assert first == second
+        assert mock_session.execute.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_cached_last_order_is_not_shared(
+        self, mock_session, sample_rfq, sample_line_items
+    ):
+        """Mutating a returned suggestion must not leak into later cache hits."""
+        svc = ReorderService(mock_session)
+        org_id = uuid.uuid4()
+
+        mock_session.execute.side_effect = [
+            _make_one_or_none_result(sample_rfq),
+            _make_all_result(sample_line_items),
+        ]
+
+        first = await svc.get_last_order(
+            vessel_id=sample_rfq.vessel_id, port="INMAA", organization_id=org_id
+        )
+        first.line_items.clear()
+        second = await svc.get_last_order(
+            vessel_id=sample_rfq.vessel_id, port="INMAA", organization_id=org_id
+        )
+
+        assert len(second.line_items) == 2
+        assert mock_session.execute.await_count == 2
+
+    def test_status_change_evicts_last_order_cache_on_commit(self, sample_rfq):
+        """An RFQ status update should evict cached lookups only once committed."""
+        key = (sample_rfq.buyer_organization_id, sample_rfq.vessel_id, None)
+        _last_order_cache[key] = None
+        session = Session()
+        session.add(sample_rfq)
+
+        sample_rfq.status = RfqStatus.AWARDED
+        _queue_last_order_eviction(MagicMock(), MagicMock(), sample_rfq)
+        assert key in _last_order_cache
+
+        _evict_last_order_cache(session)
+        assert key not in _last_order_cache
+
+    @pytest.mark.asyncio
+    async def test_get_last_orders_bulk_keyed_by_port(
+        self, mock_session, sample_rfq, sample_line_items
+    ):
+        """Bulk lookup should issue one query and key suggestions by delivery port."""
+        svc = ReorderService(mock_session)
+        sample_rfq.line_items = sample_line_items
+
+        mock_session.execute.return_value = _make_unique_scalars_result([sample_rfq])
+
+        suggestions = await svc.get_last_orders_bulk(
+            vessel_id=sample_rfq.vessel_id, ports=["INMAA", "SGSIN"]
+        )
+
+        assert list(suggestions) == ["INMAA"]
+        assert suggestions["INMAA"].source_rfq_id == sample_rfq.id
+        assert len(suggestions["INMAA"].line_items) == 2
+        assert mock_session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_last_orders_bulk_empty_ports(self, mock_session):
+        """No ports should short-circuit without querying."""
+        svc = ReorderService(mock_session)
+        assert await svc.get_last_orders_bulk(vessel_id=uuid.uuid4(), ports=[]) == {}
+        mock_session.execute.assert_not_awaited()
 
     @pytest.mark.asyncio
     async def test_copy_from_rfq_no_adjustments(
@@ -601,6 +720,24 @@ class TestPredictedItemSchema:
             )
 
 
+class TestRequestSchemaValidators:
+    def test_category_prefixes_must_be_two_ascii_digits(self):
+        assert PredictionRequest(
+            vessel_id=uuid.uuid4(), voyage_days=14, crew_size=20, categories=["00", "31"]
+        ).categories == ["00", "31"]
+        for bad in ("3", "311", "3A", "\u0663\u0661"):
+            with pytest.raises(ValueError, match="Invalid category prefix"):
+                PredictionRequest(
+                    vessel_id=uuid.uuid4(), voyage_days=14, crew_size=20, categories=[bad]
+                )
+
+    def test_impa_codes_must_be_six_ascii_digits(self):
+        assert CoOccurrenceRequest(impa_codes=["310001"]).impa_codes == ["310001"]
+        for bad in ("31000", "3100011", "31000A"):
+            with pytest.raises(ValueError, match="Invalid IMPA code format"):
+                CoOccurrenceRequest(impa_codes=[bad])
+
+
 class TestReorderServiceAdjustments:
     def test_quantity_adjustment_double_voyage(self):
         """Doubling voyage days should double quantities."""
@@ -650,3 +787,20 @@ class TestReorderServiceAdjustments:
         # (28/14) * (40/20) = 2 * 2 = 4x
         assert adjusted[0].quantity == Decimal("400.00")
         assert adjusted[0].confidence == 0.75
+
+    def test_quantity_adjustment_identity_returns_items_unchanged(self):
+        """A factor of exactly 1 should skip rebuilding the items."""
+        items = [
+            PredictedItem(
+                impa_code="000100",
+                description="Rice",
+                quantity=Decimal("100.00"),
+                unit="KG",
+                confidence=0.9,
+                category_prefix="00",
+            )
+        ]
+        adjusted = ReorderService._adjust_quantities(items, voyage_days=28, crew_size=10)
+        # (28/14) * (10/20) = 1x
+        assert adjusted is items
+        assert adjusted[0].confidence == 0.9
@@ -0,0 +1,208 @@
+"""Tests for ProductService query shapes (mocked DB)."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from src.exceptions import ConflictException, NotFoundException, ValidationException
+from src.models.enums import CategoryStatus
+from src.modules.product.schemas import ProductUpdate, SupplierPriceCreate
+from src.modules.product.service import ProductService
+from src.modules.product.validators import validate_impa_code_format
+
+
+def _page(rows: list) -> MagicMock:
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+class TestListProducts:
+    @pytest.mark.asyncio
+    async def test_total_comes_from_page_rows(self) -> None:
+        product = MagicMock()
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=_page([SimpleNamespace(Product=product, total=7)]))
+
+        products, total = await ProductService(session).list_products(search="rope", limit=1)
+
+        assert products == [product]
+        assert total == 7
+        session.execute.assert_awaited_once()
+        session.scalar.assert_not_awaited()
+        assert "count(*) OVER ()" in str(session.execute.call_args.args[0])
+
+    @pytest.mark.asyncio
+    async def test_empty_first_page_skips_count(self) -> None:
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=_page([]))
+
+        products, total = await ProductService(session).list_products()
+
+        assert (products, total) == ([], 0)
+        session.scalar.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_page_past_end_counts_separately(self) -> None:
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=_page([]))
+        session.scalar = AsyncMock(return_value=12)
+
+        products, total = await ProductService(session).list_products(ihm_relevant=True, offset=50)
+
+        assert (products, total) == ([], 12)
+        count_sql = str(session.scalar.call_args.args[0])
+        assert "count(*)" in count_sql
+        assert "products.ihm_relevant" in count_sql
+
+
+class TestActiveCategoryLookup:
+    @pytest.mark.asyncio
+    async def test_checks_unit_in_category_query(self) -> None:
+        category = SimpleNamespace(status=CategoryStatus.ACTIVE)
+        lookup = MagicMock()
+        lookup.one_or_none.return_value = (category, "PCE")
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=lookup)
+
+        result = await ProductService(session)._get_active_category(uuid.uuid4(), "PCE")
+
+        assert result is category
+        session.execute.assert_awaited_once()
+        session.get.assert_not_awaited()
+        assert "LEFT OUTER JOIN units_of_measure" in str(session.execute.call_args.args[0])
+
+    @pytest.mark.asyncio
+    async def test_unknown_unit_raises_validation(self) -> None:
+        lookup = MagicMock()
+        lookup.one_or_none.return_value = (SimpleNamespace(status=CategoryStatus.ACTIVE), None)
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=lookup)
+
+        with pytest.raises(ValidationException, match="Unit of measure 'XYZ'"):
+            await ProductService(session)._get_active_category(uuid.uuid4(), "XYZ")
+
+    @pytest.mark.asyncio
+    async def test_missing_category_raises_not_found(self) -> None:
+        lookup = MagicMock()
+        lookup.one_or_none.return_value = None
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=lookup)
+
+        with pytest.raises(NotFoundException):
+            await ProductService(session)._get_active_category(uuid.uuid4(), "PCE")
+
+
+class TestAddSupplierPrice:
+    @pytest.mark.asyncio
+    async def test_open_windows_close_in_one_update(self) -> None:
+        product_id = uuid.uuid4()
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=SimpleNamespace(product_id=product_id))
+        session.add = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock(rowcount=2))
+        data = SupplierPriceCreate(price=Decimal("12.5000"), valid_from=datetime.now(timezone.utc))
+
+        await ProductService(session).add_supplier_price(product_id, uuid.uuid4(), data, MagicMock())
+
+        session.execute.assert_awaited_once()
+        assert str(session.execute.call_args.args[0]).startswith("UPDATE supplier_product_prices")
+        audit = session.add.call_args_list[-1].args[0]
+        assert audit.changed_fields["auto_closed_count"] == 2
+
+
+def _savepoint_session() -> AsyncMock:
+    session = AsyncMock()
+    savepoint = MagicMock()
+    savepoint.__aenter__ = AsyncMock()
+    savepoint.__aexit__ = AsyncMock(return_value=False)
+    session.begin_nested = MagicMock(return_value=savepoint)
+    return session
+
+
+class TestGenerateExtensionCode:
+    @pytest.mark.asyncio
+    async def test_skips_codes_already_taken(self) -> None:
+        session = _savepoint_session()
+        taken = MagicMock()
+        taken.one.return_value = SimpleNamespace(number=100000, taken=True)
+        free = MagicMock()
+        free.one.return_value = SimpleNamespace(number=100001, taken=False)
+        session.execute = AsyncMock(side_effect=[taken, free])
+
+        code = await ProductService(session).generate_extension_code()
+
+        assert code == "EXT-100001"
+        assert session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_exhausted_sequence_raises_conflict(self) -> None:
+        session = _savepoint_session()
+        orig = Exception("nextval: reached maximum value of sequence")
+        orig.sqlstate = "2200H"
+        session.execute = AsyncMock(side_effect=DBAPIError("SELECT nextval", None, orig))
+
+        with pytest.raises(ConflictException):
+            await ProductService(session).generate_extension_code()
+
+
+class TestUpdateProduct:
+    @staticmethod
+    def _session(updated: object | None) -> AsyncMock:
+        session = AsyncMock()
+        session.get = AsyncMock(
+            return_value=SimpleNamespace(version=3, impa_code="450101", specifications={})
+        )
+        session.add = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock(**{"scalar_one_or_none.return_value": updated}))
+        return session
+
+    @pytest.mark.asyncio
+    async def test_version_and_impa_guard_run_in_the_update(self) -> None:
+        updated = SimpleNamespace(id=uuid.uuid4(), version=4)
+        session = self._session(updated)
+        data = ProductUpdate(impa_code="450102", name="Manila rope", version=3)
+
+        result = await ProductService(session).update_product(updated.id, data, MagicMock())
+
+        assert result is updated
+        session.execute.assert_awaited_once()
+        sql = str(session.execute.call_args.args[0])
+        assert sql.startswith("UPDATE products")
+        assert "products.version = " in sql
+        assert "NOT (EXISTS" in sql
+
+    @pytest.mark.asyncio
+    async def test_taken_impa_code_raises_conflict(self) -> None:
+        session = self._session(None)
+        session.scalar = AsyncMock(return_value=True)
+        data = ProductUpdate(impa_code="450102", version=3)
+
+        with pytest.raises(ConflictException, match="IMPA code '450102'"):
+            await ProductService(session).update_product(uuid.uuid4(), data, MagicMock())
+
+    @pytest.mark.asyncio
+    async def test_concurrent_update_raises_version_conflict(self) -> None:
+        session = self._session(None)
+        session.scalar = AsyncMock(return_value=4)
+        data = ProductUpdate(name="Manila rope", version=3)
+
+        with pytest.raises(ConflictException, match="expected 3, actual 4"):
+            await ProductService(session).update_product(uuid.uuid4(), data, MagicMock())
+
+
+class TestImpaCodeFormat:
+    @pytest.mark.parametrize("code", ["450101", "EXT-123456"])
+    def test_accepts_impa_and_extension_codes(self, code: str) -> None:
+        assert validate_impa_code_format(code) is True
+
+    @pytest.mark.parametrize("code", ["45010", "4501011", "450101\n", "EXT-12345", "ext-123456", ""])
+    def test_rejects_malformed_codes(self, code: str) -> None:
+        assert validate_impa_code_format(code) is False
@@ -0,0 +1,39 @@
+"""Tests for the Redis-backed catalog reference-data cache."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+import redis.asyncio as redis
+
+from src.modules.product.reference_cache import ReferenceCache
+
+
+class TestReferenceCache:
+    @pytest.mark.asyncio
+    async def test_round_trips_json_under_reference_prefix(self) -> None:
+        client = AsyncMock()
+        cache = ReferenceCache(client)
+
+        await cache.set("impa_mappings", [{"impa_prefix": "45"}], ttl=60)
+
+        key, raw = client.set.call_args.args
+        assert key == "reference:impa_mappings"
+        assert client.set.call_args.kwargs == {"ex": 60}
+
+        client.get = AsyncMock(return_value=raw)
+        assert await cache.get("impa_mappings") == [{"impa_prefix": "45"}]
+        assert json.loads(raw) == [{"impa_prefix": "45"}]
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_is_a_miss(self) -> None:
+        client = AsyncMock()
+        client.get = AsyncMock(side_effect=redis.ConnectionError("down"))
+        client.set = AsyncMock(side_effect=redis.ConnectionError("down"))
+        cache = ReferenceCache(client)
+
+        assert await cache.get("units:all") is None
+        await cache.set("units:all", [])
+        await cache.invalidate("units:all")
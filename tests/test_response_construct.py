@@ -0,0 +1,164 @@
+"""Tests for building response models from ORM objects without validation."""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from src.models.category_schema import CategorySchema
+from src.models.enums import CategoryStatus, SchemaStatus
+from src.modules.product.schemas import (
+    CategoryBreadcrumb,
+    CategorySchemaResponse,
+    CategoryTreeNode,
+    ImpaMappingResponse,
+    ProductListResponse,
+    ProductResponse,
+    SchemaHistoryItemResponse,
+)
+from src.schemas.construct import construct_from_orm
+
+
+class TestConstructFromOrm:
+    def test_reads_aliased_attribute(self) -> None:
+        now = datetime.now(timezone.utc)
+        row = SimpleNamespace(
+            id=uuid.uuid4(),
+            category_id=uuid.uuid4(),
+            version=2,
+            schema_json={"type": "object"},
+            status=SchemaStatus.ACTIVE,
+            created_by=None,
+            created_at=now,
+            activated_at=now,
+        )
+
+        resp = construct_from_orm(CategorySchemaResponse, row)
+
+        assert resp.schema_definition == {"type": "object"}
+        assert resp.model_dump(by_alias=True)["schema_json"] == {"type": "object"}
+
+    def test_missing_attribute_keeps_default(self) -> None:
+        now = datetime.now(timezone.utc)
+        row = SimpleNamespace(
+            id=uuid.uuid4(),
+            impa_code="450101",
+            issa_code=None,
+            name="Manila rope",
+            description=None,
+            category_id=uuid.uuid4(),
+            unit_of_measure="MTR",
+            ihm_relevant=False,
+            hazmat_class=None,
+            specifications={},
+            version=1,
+            created_at=now,
+            updated_at=now,
+        )
+
+        resp = construct_from_orm(ProductResponse, row)
+
+        assert resp.category_name is None
+        assert resp.impa_code == "450101"
+
+    def test_product_list_serializes_like_validated_rows(self) -> None:
+        now = datetime.now(timezone.utc)
+        row = SimpleNamespace(
+            id=uuid.uuid4(),
+            impa_code="450101",
+            issa_code=None,
+            name="Manila rope",
+            description=None,
+            category_id=uuid.uuid4(),
+            unit_of_measure="MTR",
+            ihm_relevant=False,
+            hazmat_class=None,
+            specifications={"diameter_mm": 24},
+            version=3,
+            created_at=now,
+            updated_at=now,
+        )
+
+        constructed = construct_from_orm(ProductResponse, row, category_name="Ropes")
+        validated = ProductResponse.model_validate(
+            {**vars(row), "category_name": "Ropes"}
+        )
+
+        page = ProductListResponse.model_construct(items=[constructed], total=1, limit=50, offset=0)
+
+        assert page.model_dump(mode="json")["items"] == [validated.model_dump(mode="json")]
+
+    def test_unloaded_orm_attribute_is_not_read(self) -> None:
+        now = datetime.now(timezone.utc)
+        # schema_json never set, so the ORM state reports it unloaded
+        row = CategorySchema(
+            id=uuid.uuid4(),
+            category_id=uuid.uuid4(),
+            version=1,
+            status=SchemaStatus.DRAFT,
+            created_by=None,
+            activated_at=None,
+        )
+        row.created_at = now
+
+        resp = construct_from_orm(SchemaHistoryItemResponse, row)
+
+        assert resp.schema_definition is None
+        assert resp.version == 1
+
+    def test_constructed_response_is_frozen(self) -> None:
+        row = SimpleNamespace(impa_prefix="45", impa_category_name="Ropes")
+        resp = construct_from_orm(ImpaMappingResponse, row)
+
+        with pytest.raises(ValidationError):
+            resp.impa_prefix = "46"
+
+    def test_field_pairs_are_computed_once(self) -> None:
+        from src.schemas.construct import fields_of
+
+        assert fields_of(CategorySchemaResponse) is fields_of(CategorySchemaResponse)
+        assert ("schema_definition", "schema_json") in fields_of(CategorySchemaResponse)
+
+
+class TestCategoryTreeNode:
+    def test_tree_serializes_with_every_field(self) -> None:
+        node_id = uuid.uuid4()
+        node = CategoryTreeNode(
+            id=node_id,
+            code="CAT-45",
+            name="Provisions",
+            path="root.45",
+            level=1,
+            icon=None,
+            display_order=2,
+            status=CategoryStatus.ACTIVE,
+            children_count=3,
+        )
+
+        dumped = TypeAdapter(list[CategoryTreeNode]).dump_python([node], mode="json")
+
+        assert dumped == [
+            {
+                "id": str(node_id),
+                "code": "CAT-45",
+                "name": "Provisions",
+                "path": "root.45",
+                "level": 1,
+                "icon": None,
+                "display_order": 2,
+                "status": "ACTIVE",
+                "children_count": 3,
+                "product_count": 0,
+            }
+        ]
+
+    def test_breadcrumb_is_frozen(self) -> None:
+        crumb = CategoryBreadcrumb(id=uuid.uuid4(), code="CAT-45", name="Provisions", level=1)
+
+        with pytest.raises(FrozenInstanceError):
+            crumb.level = 2